@@ -0,0 +1,137 @@
+"""
+Benchmark of the generic form handlers registered by 'HandlerManager'.
+
+Feeds synthetic callbacks and messages of the production and sales forms
+to a dispatcher and compares the handlers registered as pre-bound partials
+against wrapping them in a closure that inspects the handler signature
+on every update, as it was done before. The state manager does nothing,
+only the dispatch of the update is measured.
+
+    python bench_form_handlers.py
+"""
+
+import asyncio
+import datetime
+import inspect
+import time
+from functools import wraps
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from handlers.forms import ProductionRecordForm, SalesOrderForm
+from handlers.generic import handler_registry
+from handlers.handler_manager import HandlerManager
+from handlers.production import PRODUCTIONRECORDFORM
+from handlers.sales import SALESORDERFORM
+
+UPDATES = 10_000
+
+
+class InspectingHandlerManager(HandlerManager):
+    """Resolves the handler arguments on every update"""
+
+    def _create_handler(self, field_info):
+        var_name = field_info["var_name"]
+        next_state = field_info["next_state"]
+        handler = self._handler_registry[field_info["handler"]]["handler"]
+
+        @wraps(handler)
+        async def new_handler(
+            event, state, state_mgr, regex_res=None, callback_data=None
+        ):
+            args = inspect.getfullargspec(handler).args
+            kwargs = {
+                "event": event,
+                "state": state,
+                "state_mgr": state_mgr,
+                "callback_data": callback_data,
+                "regex_res": regex_res,
+            }
+            kwargs = {k: kwargs[k] for k in args if k in kwargs}
+
+            return await handler(var_name=var_name, next_state=next_state, **kwargs)
+
+        return new_handler
+
+
+class IdleStateManager:
+    async def push_state_stack(self, state, next_state):
+        pass
+
+    async def dispatch_query(self, message, state):
+        pass
+
+
+def make_message(chat_id, text=None):
+    return Message(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=Chat(id=chat_id, type="private"),
+        from_user=User(id=chat_id, is_bot=False, first_name="Ali"),
+        text=text,
+    )
+
+
+def make_callback(chat_id, data):
+    return CallbackQuery(
+        id="1",
+        from_user=User(id=chat_id, is_bot=False, first_name="Ali"),
+        chat_instance="1",
+        message=make_message(chat_id),
+        data=data,
+    )
+
+
+# chat id -> state the chat is kept in, update sent from it
+CHATS = {
+    1: (
+        ProductionRecordForm.branch_id,
+        {"callback_query": make_callback(1, "branch_1")},
+    ),
+    2: (SalesOrderForm.product_id, {"callback_query": make_callback(2, "product_7")}),
+    3: (ProductionRecordForm.quantity, {"message": make_message(3, "250")}),
+}
+
+
+async def make_dispatcher(bot, handler_mgr_class):
+    router = Router()
+    handler_mgr = handler_mgr_class(router=router)
+    handler_mgr.include_registry(handler_registry)
+    handler_mgr.create_handlers(form=PRODUCTIONRECORDFORM)
+    handler_mgr.create_handlers(form=SALESORDERFORM)
+
+    dp = Dispatcher(state_mgr=IdleStateManager())
+    dp.include_router(router)
+
+    for chat_id, (state, _) in CHATS.items():
+        key = StorageKey(bot_id=bot.id, chat_id=chat_id, user_id=chat_id)
+        await dp.storage.set_state(key, state)
+
+    return dp
+
+
+async def main():
+    bot = Bot(token="1:x")
+    updates = [
+        Update(update_id=i, **event) for i, (_, event) in enumerate(CHATS.values())
+    ]
+
+    for name, handler_mgr_class in (
+        ("partials", HandlerManager),
+        ("inspecting", InspectingHandlerManager),
+    ):
+        dp = await make_dispatcher(bot, handler_mgr_class)
+
+        started = time.perf_counter()
+        for i in range(UPDATES):
+            await dp.feed_update(bot, updates[i % len(updates)])
+        elapsed = time.perf_counter() - started
+        print(f"{name:>10}: {elapsed / UPDATES * 1e6:.1f} us per update")
+
+    await bot.session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
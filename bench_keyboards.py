@@ -0,0 +1,58 @@
+"""
+Micro-benchmark of 'make_inline_kb'.
+
+Compares getting the catalog and menu keyboards from the cache against
+building them with 'InlineKeyboardBuilder' on every call, as it was done
+before.
+
+    python bench_keyboards.py
+"""
+
+import sys
+import time
+
+from keyboards import branches_kb, months_kb, products_kb, save_kb, stat_period_kb
+from utils import keyboard
+
+CALLS = 1_000
+
+BRANCHES = [{"id": i, "name": f"{i}-seh"} for i in range(1, 6)]
+PRODUCTS = [{"id": i, "name": f"Blok {i}"} for i in range(1, 31)]
+
+KEYBOARDS = {
+    "branches": lambda: branches_kb(BRANCHES),
+    "products": lambda: products_kb(PRODUCTS),
+    "months": months_kb,
+    "stat period": stat_period_kb,
+    "save": lambda: save_kb(add_extra=True),
+}
+
+
+def use_cache(cache):
+    """Makes the keyboards call 'make_inline_kb' with given 'cache'"""
+
+    def make_inline_kb(*args, **kwargs):
+        return keyboard.make_inline_kb(*args, **{**kwargs, "cache": cache})
+
+    for module in list(sys.modules.values()):
+        if module is not keyboard and hasattr(module, "make_inline_kb"):
+            module.make_inline_kb = make_inline_kb
+
+
+def main():
+    for name, make_kb in KEYBOARDS.items():
+        timings = []
+        for cache in (True, False):
+            use_cache(cache)
+
+            started = time.perf_counter()
+            for _ in range(CALLS):
+                make_kb()
+            timings.append((time.perf_counter() - started) / CALLS * 1e6)
+
+        cached, built = timings
+        print(f"{name:>11}: {cached:.1f} us cached, {built:.1f} us built")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark of 'StateManager.dispatch_query'.
+
+Compares dispatching with the handler plan compiled once against
+inspecting the handler signature on every call, as it was done before.
+
+    python bench_state_manager.py
+"""
+
+import asyncio
+import inspect
+import time
+
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from test_state_manager import Form, make_message, make_state, make_state_mgr
+
+DISPATCHES = 20_000
+
+
+async def dispatch_inspecting(state_mgr, message, state):
+    """Resolves the handler arguments on every call"""
+    current = await state.get_state()
+    handler = state_mgr.handlers[current.split(":")[-1]]
+
+    call_values = {"message": message, "state": state, "edit_msg": True}
+    kwargs = {}
+    for arg in inspect.getfullargspec(handler).args:
+        if arg in call_values:
+            kwargs[arg] = call_values[arg]
+        elif arg in state_mgr.kwargs:
+            kwargs[arg] = state_mgr.kwargs[arg]
+
+    text, reply_markup = await handler(**kwargs)
+    await message.edit_text(text=text, reply_markup=reply_markup)
+
+
+async def main():
+    state_mgr = make_state_mgr()
+
+    async def fast_greet(message, state, greeting):
+        return greeting, None
+
+    # the handler of the test sleeps, only the dispatch is measured here
+    state_mgr.handlers["greet"] = fast_greet
+    state_mgr._plans["greet"] = state_mgr._compile(fast_greet)
+
+    message = make_message(1)
+    state = make_state(MemoryStorage(), 1)
+    await state.set_state(Form.greet)
+
+    for name, dispatch in (
+        ("compiled", lambda: state_mgr.dispatch_query(message=message, state=state)),
+        ("inspecting", lambda: dispatch_inspecting(state_mgr, message, state)),
+    ):
+        started = time.perf_counter()
+        for _ in range(DISPATCHES):
+            await dispatch()
+        elapsed = time.perf_counter() - started
+        print(f"{name:>10}: {elapsed / DISPATCHES * 1e6:.1f} us per dispatch")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
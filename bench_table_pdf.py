@@ -0,0 +1,73 @@
+"""
+Benchmark of the salary details report for growing tables.
+
+Compares 'to_table_pdf', which writes the pdf with 'utils.table_pdf' and
+draws only the thumbnail with matplotlib, against 'to_pdf' with the
+figure size the salary details were rendered with before, which draws
+every cell with matplotlib. The latter takes minutes past
+'MATPLOTLIB_MAX_ROWS' rows and is skipped there.
+
+    python bench_table_pdf.py
+"""
+
+import time
+from datetime import date
+
+from utils.visualize import make_df, make_human_readable, to_pdf, to_table_pdf
+
+ROWS = (100, 1_000, 10_000)
+MATPLOTLIB_MAX_ROWS = 1_000
+EMPLOYEES = 9
+
+PERIOD = {"date_from": date(2025, 3, 1), "date_to": date(2025, 3, 31)}
+
+
+def salary_details(rows):
+    """Same columns as the salary details, 5 + one per employee"""
+    details = []
+    for i in range(rows):
+        record = {
+            "date": date(2025, 3, i % 31 + 1),
+            "product_name": f"Blok {i % 30}",
+            "quantity": 100 + i % 400,
+            "rate": 150.0,
+            "emp_share": 2_500.0,
+        }
+        for emp in range(EMPLOYEES):
+            if (i + emp) % 3:
+                record[f"Ishchi {emp}"] = "+"
+
+        details.append(record)
+
+    return make_human_readable(make_df(details))
+
+
+def main():
+    # loads the fonts, so the first run is not slower than the rest
+    to_table_pdf(title="Oylik", df=salary_details(10), period=PERIOD)
+
+    for rows in ROWS:
+        df = salary_details(rows)
+        timings = []
+
+        for name, render in (
+            ("native", lambda: to_table_pdf(title="Oylik", df=df, period=PERIOD)),
+            (
+                "matplotlib",
+                lambda: to_pdf(title="Oylik", df=df, period=PERIOD, figsize=(16, 10)),
+            ),
+        ):
+            if name == "matplotlib" and rows > MATPLOTLIB_MAX_ROWS:
+                timings.append(f"{name} skipped")
+                continue
+
+            started = time.perf_counter()
+            report = render()
+            elapsed = time.perf_counter() - started
+            timings.append(f"{name} {elapsed:.2f} s, {len(report.pdf) / 1024:.0f} KB")
+
+        print(f"{rows:>6} rows: {'; '.join(timings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Replays updates against the webhook server, without Telegram.
+
+The updates are read from a file with one update per line, as they were
+received from Telegram, or made up if no file is given. They are posted
+to a local server built with 'make_webhook_app', the handler only waits
+for 'HANDLER_LATENCY' seconds as if it talked to the database and the API.
+Prints updates per second for every concurrency limit.
+
+    python bench_webhook.py [updates.jsonl]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+from aiohttp import ClientSession, web
+
+from utils.webhook import make_webhook_app
+
+UPDATES = 2_000
+CLIENT_CONNECTIONS = 40
+HANDLER_LATENCY = 0.05
+CONCURRENCY_LIMITS = (1, 10, 100)
+
+HOST = "127.0.0.1"
+PORT = 8099
+PATH = "/webhook"
+SECRET_TOKEN = "bench"
+
+
+def load_updates(path=None):
+    if path:
+        with open(path) as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    return [
+        {
+            "update_id": i,
+            "message": {
+                "message_id": i,
+                "date": 0,
+                "chat": {"id": i % 100, "type": "private"},
+                "from": {"id": i % 100, "is_bot": False, "first_name": "Ali"},
+                "text": "Salom",
+            },
+        }
+        for i in range(1, UPDATES + 1)
+    ]
+
+
+async def replay(updates, concurrency_limit):
+    handled = 0
+    done = asyncio.Event()
+
+    dp = Dispatcher()
+
+    @dp.message()
+    async def handler(message: Message):
+        nonlocal handled
+        await asyncio.sleep(HANDLER_LATENCY)
+        handled += 1
+        if handled == len(updates):
+            done.set()
+
+    bot = Bot(token="1:x")
+    app = make_webhook_app(
+        dp,
+        bot,
+        path=PATH,
+        concurrency_limit=concurrency_limit,
+        secret_token=SECRET_TOKEN,
+    )
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=HOST, port=PORT).start()
+
+    queue = asyncio.Queue()
+    for update in updates:
+        queue.put_nowait(update)
+
+    async def post(session):
+        while not queue.empty():
+            update = queue.get_nowait()
+            async with session.post(
+                f"http://{HOST}:{PORT}{PATH}",
+                json=update,
+                headers={"X-Telegram-Bot-Api-Secret-Token": SECRET_TOKEN},
+            ) as resp:
+                resp.raise_for_status()
+
+    try:
+        started = time.perf_counter()
+        async with ClientSession() as session:
+            await asyncio.gather(*(post(session) for _ in range(CLIENT_CONNECTIONS)))
+        await done.wait()
+        elapsed = time.perf_counter() - started
+
+    finally:
+        await runner.cleanup()
+
+    return elapsed
+
+
+async def main():
+    updates = load_updates(sys.argv[1] if len(sys.argv) > 1 else None)
+
+    for concurrency_limit in CONCURRENCY_LIMITS:
+        elapsed = await replay(updates, concurrency_limit)
+        print(
+            f"{concurrency_limit:>4} at a time: "
+            f"{len(updates) / elapsed:.0f} updates per second"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,7 @@ if TYPE_CHECKING:
 
 BOT_DIR = Path(__file__).absolute().parent
 MEDIA_DIR = Path(BOT_DIR, "media")
+STORAGE_DIR = Path(BOT_DIR, "storage")  # files that must survive a restart
 LOCALES_DIR = Path.joinpath(BOT_DIR, "locales")
 I18N_DOMAIN = "messages"
 DEFAULT_LOCALE = "en"
@@ -24,7 +25,19 @@ class EnvBaseSettings(BaseSettings):
 class BotSettings(EnvBaseSettings):
     BOT_TOKEN: str
     SUPPORT_URL: str | None = None
-    RATE_LIMIT: int | float = 0.5  # for throttling control
+    RATE_LIMIT: int | float = 0.5  # seconds between requests to one chat
+    DEBOUNCE_WINDOW: int | float = 1  # seconds a repeated tap on a button is dropped
+    MAX_UPDATES_IN_FLIGHT: int = 1  # per user, the next ones wait
+    MAX_UPDATES_QUEUED: int = 3  # per user, the next ones are dropped
+    UPDATES_CONCURRENCY: int = 100  # updates handled at the same time
+
+    # long polling is used if WEBHOOK_URL is not set
+    WEBHOOK_URL: str | None = None  # public https address of the bot
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_MAX_CONNECTIONS: int = 40  # connections Telegram may open, 1-100
+    WEBAPP_HOST: str = "0.0.0.0"
+    WEBAPP_PORT: int = 8080
 
 
 class DBSettings(EnvBaseSettings):
@@ -49,7 +62,28 @@ class DBSettings(EnvBaseSettings):
         )
 
 
-class Settings(BotSettings, DBSettings):
+class CacheSettings(EnvBaseSettings):
+    CATALOG_CACHE_TTL: int = 600  # seconds
+    CATALOG_CACHE_SIZE: int = 1024  # entries per repository
+    AUTH_CACHE_TTL: int = 300  # seconds
+    AUTH_CACHE_NEGATIVE_TTL: int = 60  # seconds, for unknown users
+    AUTH_CACHE_SIZE: int = 10_000
+
+
+class FSMSettings(EnvBaseSettings):
+    FSM_STORAGE_PATH: Path = Path(STORAGE_DIR, "fsm.sqlite3")
+    FSM_STATE_TTL: int = 7 * 24 * 60 * 60  # seconds, idle states are dropped
+
+
+class ReportSettings(EnvBaseSettings):
+    REPORT_WORKERS: int = 2  # processes rendering reports
+    REPORT_QUEUE_SIZE: int = 8  # reports waiting for a process, then refused
+    REPORT_WORKER_MAX_TASKS: int = 500  # reports a process renders, then restarts
+    REPORT_CACHE_TTL: int = 60 * 60  # seconds
+    REPORT_CACHE_SIZE: int = 64
+
+
+class Settings(BotSettings, DBSettings, CacheSettings, FSMSettings, ReportSettings):
     SUPER_ADMIN: int
     DEBUG: bool = False
 
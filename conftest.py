@@ -0,0 +1,5 @@
+import os
+
+# 'config.settings' is created on import and requires these
+os.environ.setdefault("BOT_TOKEN", "1:test")
+os.environ.setdefault("SUPER_ADMIN", "1")
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
+from data.exceptions import RateNotFound
 from data.repositories import (
     IBranchRepository,
     IOrderRepository,
@@ -52,51 +53,92 @@ class Accounting:
     #
     #     return
 
-    def calculate_salary(
+    async def salary_details(
         self, period: Dict[str, date], branch_id: int
-    ) -> Dict[str, Any]:
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Calculates salary for given branch and period.
+        Streams the records of the branch for given period with the rate,
+        the share of each employee and a '+' for every employee on duty.
 
         Params:
             period: - Dict[str, date]. Example {'date_from': date obj, 'date_to': date obj}
-                period should have 'date_from' and 'date_to' keywords!
             branch_id: - int
 
         Returns:
-            Dict[str, Any]
+            AsyncIterator[List[Dict[str, Any]]] - batches of records
+
+        Raises:
+            RateNotFound - if no rate covers the date of a record
         """
-        if "date_from" not in period or "date_to" not in period:
-            raise KeyError("'date_from' or 'date_to' should be in period dictionary")
+        self._check_period(period)
+
+        async for records in self._prod_repo.stream_salary_details(
+            branch_id=branch_id, **period  # type: ignore
+        ):
+            batch = []
+            for record in records:
+                if record["rate"] is None:
+                    raise RateNotFound(
+                        product_name=record["product_name"], date=record["date"]
+                    )
 
-        records = self._prod_repo.filter_by_period(branch_id=branch_id, **period)  # type: ignore
+                data = {
+                    "date": record["date"],
+                    "product_name": record["product_name"],
+                    "quantity": record["quantity"],
+                    "rate": float(record["rate"]),
+                    "emp_share": float(record["emp_share"]),
+                }
+                for emp_first_name in record["employees"]:
+                    data[emp_first_name] = "+"
 
-        all_records = {"details": [], "summary": {}}
+                batch.append(data)
 
-        for record in records:
-            if record.employees:
-                rate = float(record.product.rates[0].payment_rate)  # parse to float
+            yield batch
 
-                total_employees = len(record.employees)
-                employee_share = rate * record.quantity / total_employees
-                data = {
-                    "date": record.date,
-                    "product_name": record.product.name,
-                    "quantity": record.quantity,
-                    "rate": rate,
-                    "emp_share": employee_share,
-                }
+    async def salary_summary(
+        self, period: Dict[str, date], branch_id: int
+    ) -> Dict[str, float]:
+        """
+        Calculates the salary of every employee of the branch for given period.
 
-                summary = all_records["summary"]
-                for emp in record.employees:
-                    emp_first_name = emp.employee.first_name
+        Params:
+            period: - Dict[str, date]. Example {'date_from': date obj, 'date_to': date obj}
+            branch_id: - int
 
-                    data[emp_first_name] = "+"
-                    summary[emp_first_name] = (
-                        summary.get(emp_first_name, 0) + employee_share
-                    )
-                    summary["Total"] = summary.get("Total", 0) + employee_share
+        Returns:
+            Dict[str, float] - salary by employee first name and the 'Total',
+                empty if nobody worked in the period
+
+        Raises:
+            RateNotFound - if no rate covers the date of a record
+        """
+        self._check_period(period)
 
-                all_records["details"].append(data)
+        # a record without a rate would be left out of the sums silently
+        unrated = await self._prod_repo.first_unrated_record(
+            branch_id=branch_id, **period  # type: ignore
+        )
+        if unrated is not None:
+            raise RateNotFound(
+                product_name=unrated["product_name"], date=unrated["date"]
+            )
 
-        return all_records
+        salaries = await self._prod_repo.salary_summary(branch_id=branch_id, **period)  # type: ignore
+
+        summary = {}
+        for salary in salaries:
+            emp_first_name = salary["first_name"]
+            summary[emp_first_name] = summary.get(emp_first_name, 0) + float(
+                salary["salary"]
+            )
+
+        if summary:
+            summary["Total"] = sum(summary.values())
+
+        return summary
+
+    @staticmethod
+    def _check_period(period: Dict[str, date]) -> None:
+        if "date_from" not in period or "date_to" not in period:
+            raise KeyError("'date_from' or 'date_to' should be in period dictionary")
@@ -2,8 +2,6 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from data.exceptions import RecordNotFound
-
 if TYPE_CHECKING:
     from aiogram.fsm.context import FSMContext
 
@@ -15,13 +13,12 @@ async def login(user_id: int, state: FSMContext, user_repo: IUserRepository) ->
     user = session["user"]
 
     if user is None:
-        try:
-            user = user_repo.get_by_id(user_id=user_id)
-            session["user"] = user
-            await state.update_data(session=session)
-            return True
+        user = await user_repo.get_credentials(user_id=user_id)
 
-        except RecordNotFound:
+        if user is None:
             return False
 
+        session["user"] = user
+        await state.update_data(session=session)
+
     return True
@@ -3,18 +3,34 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from config import settings
 
 if TYPE_CHECKING:
     from sqlalchemy import URL, Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
     from sqlalchemy.orm import Session
 
 
-def get_engine(url: URL | str = settings.database_url) -> Engine:
+def get_engine(url: URL | str = settings.database_url_psycopg2) -> Engine:
     return create_engine(url, echo=settings.DEBUG)
 
 
 def get_sessionmaker(engine: Engine) -> "sessionmaker[Session]":
     return sessionmaker(engine)
+
+
+def get_async_engine(url: URL | str = settings.database_url) -> AsyncEngine:
+    return create_async_engine(url, echo=settings.DEBUG, pool_pre_ping=True)
+
+
+def get_async_sessionmaker(engine: AsyncEngine) -> "async_sessionmaker[AsyncSession]":
+    # objects are used by handlers after the session is closed,
+    # so they must not be expired on commit (that would trigger lazy IO)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+# rows fetched per round trip when a report query is streamed
+STREAM_BATCH_SIZE = 1000
@@ -1,2 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import date
+
+
 class RecordNotFound(Exception):
     pass
+
+
+class RateNotFound(RecordNotFound):
+    """There is no product rate in effect on the date of a production record"""
+
+    def __init__(self, product_name: str, date: date) -> None:
+        super().__init__(f"There is no rate for {product_name} on {date:%d.%m.%Y}")
+        self.product_name = product_name
+        self.date = date
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import (DATE, TIMESTAMP, ForeignKey, Numeric, String,
+from sqlalchemy import (DATE, TIMESTAMP, ForeignKey, Index, Numeric, String,
                         UniqueConstraint, text)
 from sqlalchemy.dialects.postgresql import BIGINT
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -62,6 +62,11 @@ class ProductionRecord(Base):
     employees = relationship("Attendance", back_populates="production_record")
     product: Mapped["Product"] = relationship()
 
+    __table_args__ = (
+        # salary summary/details and unrated records of a branch for a period
+        Index("ix_production_records_branch_id_date", "branch_id", "date"),
+    )
+
 
 class Employee(Base):
     __tablename__ = "employees"
@@ -87,6 +92,13 @@ class Attendance(Base):
     employee = relationship("Employee", back_populates="attendances")
     production_record = relationship("ProductionRecord", back_populates="employees")
 
+    __table_args__ = (
+        # crews of the records in the salary queries
+        Index("ix_attendance_production_record_id", "production_record_id"),
+        # foreign key checks when an employee is deleted
+        Index("ix_attendance_employee_id", "employee_id"),
+    )
+
 
 class BranchProduct(Base):
     __tablename__ = "branch_products"
@@ -123,3 +135,25 @@ class ProductRate(Base):
     payment_rate: Mapped[float] = mapped_column(Numeric(10, 2))
     effective_date: Mapped[str] = mapped_column(DATE)
     end_date: Mapped[str] = mapped_column(DATE)
+
+
+class DailyProductTotal(Base):
+    """Per day totals of 'ProductionRecord' and 'Order', used by the reports"""
+
+    __tablename__ = "daily_product_totals"
+
+    date: Mapped[str] = mapped_column(DATE, primary_key=True)
+    branch_id: Mapped[int] = mapped_column(ForeignKey("branches.id"), primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), primary_key=True)
+    produced_quantity: Mapped[int] = mapped_column(
+        BIGINT, default=0, server_default=text("0")
+    )
+    used_cement_amount: Mapped[float] = mapped_column(
+        default=0, server_default=text("0")
+    )
+    sold_quantity: Mapped[int] = mapped_column(
+        BIGINT, default=0, server_default=text("0")
+    )
+    sold_amount: Mapped[int] = mapped_column(
+        BIGINT, default=0, server_default=text("0")
+    )
@@ -0,0 +1,48 @@
+"""
+Resolution of the payment rate of a product on a date.
+
+A product has a history of rates, each in effect from its 'effective_date'
+to its 'end_date'. The salary of a production record is paid at the rate
+in effect on the record's date, not at the latest one, so the salaries
+of past months don't change when a new rate is set.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import desc, select
+
+from data.models import ProductRate
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from sqlalchemy import ColumnElement, ScalarSelect
+
+
+def rate_in_effect(
+    product_id: ColumnElement[int], on_date: ColumnElement[date]
+) -> ScalarSelect:
+    """
+    Payment rate of the product in effect on the date, as a scalar subquery
+    correlated to the query the columns come from. Of the rates covering
+    the date the one with the latest 'effective_date' wins, NULL if no rate
+    covers it.
+
+    Params
+        product_id: column of the product id, e.g. 'ProductionRecord.product_id'
+        on_date: column of the date, e.g. 'ProductionRecord.date'
+    """
+    return (
+        select(ProductRate.payment_rate)
+        .where(
+            ProductRate.product_id == product_id,
+            ProductRate.effective_date <= on_date,
+            ProductRate.end_date >= on_date,
+        )
+        .order_by(desc(ProductRate.effective_date))
+        .limit(1)
+        .correlate_except(ProductRate)
+        .scalar_subquery()
+    )
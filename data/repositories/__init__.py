@@ -1,4 +1,5 @@
 from .branch_repository import *
+from .cached_repository import *
 from .employee_repository import *
 from .order_repository import *
 from .product_repository import *
@@ -6,9 +6,10 @@ from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Type, Union
 from sqlalchemy import select
 
 from data.exceptions import RecordNotFound
+from data.models import BranchProduct, Product
 
 if TYPE_CHECKING:
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
     from data.models import Branch
 
@@ -21,7 +22,7 @@ class IBranchRepository(ABC):
         self._model = model
 
     @abstractmethod
-    def all(
+    async def all(
         self, as_dict: bool = False
     ) -> Union[Sequence[Branch], List[Dict[str, Any]]]:
         """
@@ -34,7 +35,7 @@ class IBranchRepository(ABC):
         pass
 
     @abstractmethod
-    def get_by_id(self, branch_id: int) -> Branch:
+    async def get_by_id(self, branch_id: int) -> Branch:
         """
         Retrieves one branch
 
@@ -49,13 +50,16 @@ class IBranchRepository(ABC):
         """
 
     @abstractmethod
-    def get_branch_products(self, branch_id: int) -> List[Dict[str, Any]]:
+    async def get_branch_products(self, branch_id: int) -> List[Dict[str, Any]]:
         """
         Returns branch products
 
         Param
             branch_id: Branch id
 
+        Returns
+            List[Dict[str, Any]] - 'id' and 'name' of each product
+
         Raises
             RecordNotFound
         """
@@ -63,40 +67,47 @@ class IBranchRepository(ABC):
 
 class BranchRepository(IBranchRepository):
 
-    def __init__(self, session: "sessionmaker[Session]", model: Type[Branch]) -> None:
+    def __init__(
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[Branch]
+    ) -> None:
         super().__init__(session=session, model=model)
 
-    def all(
+    async def all(
         self, as_dict: bool = False
     ) -> Union[Sequence[Branch], List[Dict[str, Any]]]:
-        with self._session() as session:
+        async with self._session() as session:
             stmt = select(self._model.id, self._model.name)
-            results = session.execute(stmt)
+            results = await session.execute(stmt)
 
             if as_dict is True:
                 return results.mappings().all()
 
             return results.scalars().all()
 
-    def get_by_id(self, branch_id: int) -> Branch:
-        with self._session() as session:
-            result = session.get(self._model, branch_id)
+    async def get_by_id(self, branch_id: int) -> Branch:
+        async with self._session() as session:
+            result = await session.get(self._model, branch_id)
 
             if not result:
                 raise RecordNotFound(f"There is no branch with id {branch_id}")
 
             return result
 
-    def get_branch_products(self, branch_id: int) -> List[Dict[str, Any]]:
-        with self._session() as session:
-            result = session.get(self._model, branch_id)
-
-            if not result:
-                raise RecordNotFound(f"There is no branch with id {branch_id}")
-
-            products = []
-            for res in result.branch_products:
-
-                products.append(res.product.__dict__)
-
-        return products
+    async def get_branch_products(self, branch_id: int) -> List[Dict[str, Any]]:
+        async with self._session() as session:
+            # outer joins keep one row for a branch without products,
+            # so a missing branch can be told apart in the same query
+            stmt = (
+                select(Product.id, Product.name)
+                .select_from(self._model)
+                .outerjoin(BranchProduct, BranchProduct.branch_id == self._model.id)
+                .outerjoin(Product, Product.id == BranchProduct.product_id)
+                .where(self._model.id == branch_id)
+                .order_by(BranchProduct.id)
+            )
+            rows = (await session.execute(stmt)).mappings().all()
+
+        if not rows:
+            raise RecordNotFound(f"There is no branch with id {branch_id}")
+
+        return [dict(row) for row in rows if row["id"] is not None]
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from utils.cache import MISSING
+
+from .branch_repository import IBranchRepository
+from .employee_repository import IEmployeeRepository
+from .product_repository import IProductRepository
+from .user_repository import IUserRepository
+
+if TYPE_CHECKING:
+    from data.models import Branch, Employee, Product, User
+    from utils.cache import TTLCache
+
+
+class _CatalogCache:
+    """
+    Read-through caching for the repositories of rarely changing data.
+    'listeners' are called on 'invalidate', e.g. to drop data built from
+    the cached entries elsewhere.
+    """
+
+    def __init__(
+        self, cache: TTLCache, listeners: Sequence[Callable[[], None]] = ()
+    ) -> None:
+        self._cache = cache
+        self._listeners = listeners
+
+    async def _get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = self._cache.get(key)
+
+        if value is MISSING:
+            value = await loader()
+            self._cache.set(key, value)
+
+        return value
+
+    def invalidate(self) -> None:
+        """Drops all cached entries, call it after the catalog changes"""
+        self._cache.clear()
+
+        for listener in self._listeners:
+            listener()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats
+
+
+class CachedBranchRepository(_CatalogCache, IBranchRepository):
+
+    def __init__(
+        self,
+        repository: IBranchRepository,
+        cache: TTLCache,
+        listeners: Sequence[Callable[[], None]] = (),
+    ) -> None:
+        IBranchRepository.__init__(
+            self, session=repository._session, model=repository._model
+        )
+        _CatalogCache.__init__(self, cache=cache, listeners=listeners)
+        self._repository = repository
+
+    async def all(
+        self, as_dict: bool = False
+    ) -> Union[Sequence[Branch], List[Dict[str, Any]]]:
+        return await self._get_or_load(
+            ("all", as_dict), lambda: self._repository.all(as_dict=as_dict)
+        )
+
+    async def get_by_id(self, branch_id: int) -> Branch:
+        return await self._get_or_load(
+            ("get_by_id", branch_id),
+            lambda: self._repository.get_by_id(branch_id=branch_id),
+        )
+
+    async def get_branch_products(self, branch_id: int) -> List[Dict[str, Any]]:
+        return await self._get_or_load(
+            ("get_branch_products", branch_id),
+            lambda: self._repository.get_branch_products(branch_id=branch_id),
+        )
+
+
+class CachedProductRepository(_CatalogCache, IProductRepository):
+
+    def __init__(
+        self,
+        repository: IProductRepository,
+        cache: TTLCache,
+        listeners: Sequence[Callable[[], None]] = (),
+    ) -> None:
+        IProductRepository.__init__(
+            self, session=repository._session, model=repository._model
+        )
+        _CatalogCache.__init__(self, cache=cache, listeners=listeners)
+        self._repository = repository
+
+    async def all(self) -> Sequence[Product]:
+        return await self._get_or_load(("all",), self._repository.all)
+
+    async def get_by_id(self, product_id: int) -> Product:
+        return await self._get_or_load(
+            ("get_by_id", product_id),
+            lambda: self._repository.get_by_id(product_id=product_id),
+        )
+
+
+class CachedEmployeeRepository(_CatalogCache, IEmployeeRepository):
+
+    def __init__(
+        self,
+        repository: IEmployeeRepository,
+        cache: TTLCache,
+        listeners: Sequence[Callable[[], None]] = (),
+    ) -> None:
+        IEmployeeRepository.__init__(
+            self, session=repository._session, model=repository._model
+        )
+        _CatalogCache.__init__(self, cache=cache, listeners=listeners)
+        self._repository = repository
+
+    async def all(self, branch_id: int) -> Sequence[Employee]:
+        return await self._get_or_load(
+            ("all", branch_id), lambda: self._repository.all(branch_id=branch_id)
+        )
+
+
+class CachedUserRepository(IUserRepository):
+    """
+    Caches the credentials looked up on login. Unknown ids are cached too,
+    for 'negative_ttl' seconds, so messages from strangers do not reach
+    the database every time.
+    """
+
+    def __init__(
+        self, repository: IUserRepository, cache: TTLCache, negative_ttl: float
+    ) -> None:
+        super().__init__(session=repository._session, model=repository._model)
+        self._repository = repository
+        self._cache = cache
+        self._negative_ttl = negative_ttl
+
+    async def create(self, new_user: User) -> User:
+        user = await self._repository.create(new_user=new_user)
+        self._cache.pop(user.id)
+
+        return user
+
+    async def get_by_id(self, user_id: int) -> User:
+        return await self._repository.get_by_id(user_id=user_id)
+
+    async def get_credentials(self, user_id: int) -> Optional[Dict[str, Any]]:
+        credentials = self._cache.get(user_id)
+
+        if credentials is MISSING:
+            credentials = await self._repository.get_credentials(user_id=user_id)
+            self._cache.set(
+                user_id,
+                credentials,
+                ttl=None if credentials is not None else self._negative_ttl,
+            )
+
+        return credentials
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats
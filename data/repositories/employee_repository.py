@@ -6,18 +6,20 @@ from typing import TYPE_CHECKING, Sequence, Type
 from sqlalchemy import select
 
 if TYPE_CHECKING:
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
     from data.models import Employee
 
 
 class IEmployeeRepository(ABC):
-    def __init__(self, session: "sessionmaker[Session]", model: Type[Employee]) -> None:
+    def __init__(
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[Employee]
+    ) -> None:
         self._session = session
         self._model = model
 
     @abstractmethod
-    def all(self, branch_id: int) -> Sequence[Employee]:
+    async def all(self, branch_id: int) -> Sequence[Employee]:
         """
         Retrieves all employees available to the branch
 
@@ -32,13 +34,15 @@ class IEmployeeRepository(ABC):
 
 class EmployeeRepository(IEmployeeRepository):
 
-    def __init__(self, session: "sessionmaker[Session]", model: Type[Employee]) -> None:
+    def __init__(
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[Employee]
+    ) -> None:
         super().__init__(session=session, model=model)
 
-    def all(self, branch_id: int) -> Sequence[Employee]:
+    async def all(self, branch_id: int) -> Sequence[Employee]:
 
-        with self._session() as session:
+        async with self._session() as session:
             stmt = select(self._model).where(self._model.branch_id == branch_id)
-            res = session.execute(stmt).scalars().all()
+            res = (await session.execute(stmt)).scalars().all()
 
             return res
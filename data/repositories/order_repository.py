@@ -2,27 +2,40 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
-
-from sqlalchemy import desc, func, select, text
-
-from data.models import Product
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
+from sqlalchemy import desc, func, insert, select, text
+
+from data.db import STREAM_BATCH_SIZE
+from data.models import DailyProductTotal, Product
+from data.rollups import add_sales_totals
 
 if TYPE_CHECKING:
     from datetime import date
 
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
     from data.models import Order
 
 
 class IOrderRepository(ABC):
-    def __init__(self, session: "sessionmaker[Session]", model: Type[Order]) -> None:
+    def __init__(
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[Order]
+    ) -> None:
         self._session = session
         self._model = model
 
     @abstractmethod
-    def create_new(self, new_order: Order) -> Order:
+    async def create_new(self, new_order: Order) -> Order:
         """
         Creates new sales order
 
@@ -34,7 +47,19 @@ class IOrderRepository(ABC):
         """
 
     @abstractmethod
-    def filter(
+    async def create_many(self, new_orders: Sequence[Dict[str, Any]]) -> List[int]:
+        """
+        Creates several sales orders with one statement in one transaction
+
+        Param
+            new_orders: order fields, one dictionary per order
+
+        Returns
+            List[int] - ids of the created orders
+        """
+
+    @abstractmethod
+    async def filter(
         self,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
@@ -50,45 +75,111 @@ class IOrderRepository(ABC):
             List[Dict[str, Any]]
         """
 
+    @abstractmethod
+    def stream_filter(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        """
+        Same as 'filter', but reads the result through a server-side cursor.
+
+        Params
+            date_from: Start of the period, if none default is '2000-01-01'
+            date_to: End of the period, if none default is 'datetime.now().date()'
+            batch_size: max number of rows in one batch
+
+        Returns
+            AsyncIterator[Sequence[Dict[str, Any]]] - batches of rows
+        """
+
 
 class OrderRepository(IOrderRepository):
-    def __init__(self, session: "sessionmaker[Session]", model: Type[Order]) -> None:
+    def __init__(
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[Order]
+    ) -> None:
         super().__init__(session=session, model=model)
 
-    def create_new(self, new_order: Order) -> Order:
-        with self._session() as session:
+    async def create_new(self, new_order: Order) -> Order:
+        async with self._session() as session:
             session.add(new_order)
-            session.commit()
-            session.refresh(new_order)
+            await session.flush()
+            await add_sales_totals(
+                session,
+                [
+                    {
+                        "date": new_order.date,
+                        "branch_id": new_order.branch_id,
+                        "product_id": new_order.product_id,
+                        "quantity": new_order.quantity,
+                        "total_amount": new_order.total_amount,
+                    }
+                ],
+            )
+            await session.commit()
+            await session.refresh(new_order)
 
             return new_order
 
-    def filter(
-        self,
-        date_from: Optional[date] = None,
-        date_to: Optional[date] = None,
-    ) -> List[Dict[str, Any]]:
+    async def create_many(self, new_orders: Sequence[Dict[str, Any]]) -> List[int]:
+        if not new_orders:
+            return []
+
+        async with self._session() as session:
+            stmt = (
+                insert(self._model).values(list(new_orders)).returning(self._model.id)
+            )
+            ids = (await session.execute(stmt)).scalars().all()
+            await add_sales_totals(session, new_orders)
+            await session.commit()
+
+            return list(ids)
+
+    def _filter_stmt(self, date_from: Optional[date], date_to: Optional[date]):
         if date_to is None:
             date_to = datetime.now().date()
 
         if date_from is None:
             date_from = datetime.strptime("2000-01-01", "%Y-%m-%d")
 
-        with self._session() as session:
-            select_stmt = (
-                select(
-                    Product.name,
-                    func.sum(self._model.quantity).label("total_count"),
-                    func.sum(self._model.total_amount).label("total_amount"),
-                )
-                .where(
-                    self._model.date >= date_from,
-                    self._model.date <= date_to,
-                )
-                .join(Product)
-                .group_by(self._model.product_id, Product.name)
-                .order_by(desc(text("total_count")))
+        return (
+            select(
+                Product.name,
+                func.sum(DailyProductTotal.sold_quantity).label("total_count"),
+                func.sum(DailyProductTotal.sold_amount).label("total_amount"),
+            )
+            .where(
+                DailyProductTotal.date >= date_from,
+                DailyProductTotal.date <= date_to,
             )
-            res = session.execute(select_stmt).mappings().all()
+            .join(Product)
+            .group_by(DailyProductTotal.product_id, Product.name)
+            .having(func.sum(DailyProductTotal.sold_quantity) > 0)
+            .order_by(desc(text("total_count")))
+        )
+
+    async def filter(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        async with self._session() as session:
+            select_stmt = self._filter_stmt(date_from=date_from, date_to=date_to)
+            res = (await session.execute(select_stmt)).mappings().all()
 
             return res  # type: ignore
+
+    async def stream_filter(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        async with self._session() as session:
+            result = await session.stream(
+                self._filter_stmt(date_from=date_from, date_to=date_to),
+                execution_options={"yield_per": batch_size},
+            )
+            async for batch in result.mappings().partitions():
+                yield batch  # type: ignore
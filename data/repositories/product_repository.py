@@ -8,7 +8,7 @@ from sqlalchemy import select
 from data.exceptions import RecordNotFound
 
 if TYPE_CHECKING:
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
     from data.models import Product
 
@@ -16,12 +16,14 @@ if TYPE_CHECKING:
 class IProductRepository(ABC):
     """Repository interface for handling database transactions against 'Product' model"""
 
-    def __init__(self, session: "sessionmaker[Session]", model: Type[Product]) -> None:
+    def __init__(
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[Product]
+    ) -> None:
         self._session = session
         self._model = model
 
     @abstractmethod
-    def all(self) -> Sequence[Product]:
+    async def all(self) -> Sequence[Product]:
         """
         Retrieves all products available to the branch
 
@@ -34,7 +36,7 @@ class IProductRepository(ABC):
         pass
 
     @abstractmethod
-    def get_by_id(self, product_id: int) -> Product:
+    async def get_by_id(self, product_id: int) -> Product:
         """
         Returns the with product with specified id
 
@@ -49,19 +51,21 @@ class IProductRepository(ABC):
 
 class ProductRepository(IProductRepository):
 
-    def __init__(self, session: "sessionmaker[Session]", model: Type[Product]) -> None:
+    def __init__(
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[Product]
+    ) -> None:
         super().__init__(session=session, model=model)
 
-    def all(self) -> Sequence[Product]:
-        with self._session() as session:
+    async def all(self) -> Sequence[Product]:
+        async with self._session() as session:
             stmt = select(self._model)
-            results = session.execute(stmt).scalars().all()
+            results = (await session.execute(stmt)).scalars().all()
 
             return results
 
-    def get_by_id(self, product_id: int) -> Product:
-        with self._session() as session:
-            result = session.get(self._model, product_id)
+    async def get_by_id(self, product_id: int) -> Product:
+        async with self._session() as session:
+            result = await session.get(self._model, product_id)
 
             if not result:
                 raise RecordNotFound(f"There is no record with id {product_id}")
@@ -2,28 +2,45 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
-
-from sqlalchemy import desc, func, select, text
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
+from sqlalchemy import desc, func, insert, select, text
 from sqlalchemy.orm import selectinload
 
-from data.models import Attendance, Product
+from data.db import STREAM_BATCH_SIZE
+from data.models import (
+    Attendance,
+    DailyProductTotal,
+    Employee,
+    Product,
+)
+from data.rates import rate_in_effect
+from data.rollups import add_production_totals
 
 if TYPE_CHECKING:
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
     from data.models import ProductionRecord
 
 
 class IProductionRecordRepository(ABC):
     def __init__(
-        self, session: "sessionmaker[Session]", model: Type[ProductionRecord]
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[ProductionRecord]
     ) -> None:
         self._session = session
         self._model = model
 
     @abstractmethod
-    def create_record(self, new_record: ProductionRecord) -> ProductionRecord:
+    async def create_record(self, new_record: ProductionRecord) -> ProductionRecord:
         """
         Creates new production record.
 
@@ -36,7 +53,7 @@ class IProductionRecordRepository(ABC):
         pass
 
     @abstractmethod
-    def create_attendance_record(self, new_records: List[Attendance]) -> None:
+    async def create_attendance_record(self, new_records: List[Attendance]) -> None:
         """
         Creates new attendance record.
 
@@ -47,7 +64,23 @@ class IProductionRecordRepository(ABC):
         """
 
     @abstractmethod
-    def stat(
+    async def create_record_with_attendance(
+        self, new_record: ProductionRecord, employee_ids: Sequence[int]
+    ) -> ProductionRecord:
+        """
+        Creates new production record together with its attendance
+        in a single transaction.
+
+        Params
+            new_record: new production record
+            employee_ids: ids of the employees who were on duty
+
+        Returns
+            Newly created record
+        """
+
+    @abstractmethod
+    async def stat(
         self,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
@@ -64,7 +97,26 @@ class IProductionRecordRepository(ABC):
         """
 
     @abstractmethod
-    def filter_by_period(
+    def stream_stat(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        """
+        Same as 'stat', but reads the result through a server-side cursor.
+
+        Params
+            date_from: Start of the period, if none default is '2000-01-01'
+            date_to: End of the period, if none default is 'datetime.now().date()'
+            batch_size: max number of rows in one batch
+
+        Returns
+            AsyncIterator[Sequence[Dict[str, Any]]] - batches of rows
+        """
+
+    @abstractmethod
+    async def filter_by_period(
         self, date_from: date, date_to: date
     ) -> List[ProductionRecord]:
         """
@@ -81,81 +133,376 @@ class IProductionRecordRepository(ABC):
             List[ProductionRecord] - result of select query
         """
 
+    @abstractmethod
+    def stream_by_period(
+        self,
+        date_from: date,
+        date_to: date,
+        branch_id: Optional[int] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[ProductionRecord]]:
+        """
+        Same as 'filter_by_period', but reads the records through
+        a server-side cursor. Collections are loaded per batch.
+
+        Params:
+            date_from: date obj - start of the period (included)
+            date_to: date obj - end of the period (included)
+            branch_id: Optional[int] - 'Branch' id.
+                if None all branch records will be retrieved
+            batch_size: max number of records in one batch
+
+        Returns:
+            AsyncIterator[Sequence[ProductionRecord]] - batches of records
+        """
+
+    @abstractmethod
+    async def first_unrated_record(
+        self, date_from: date, date_to: date, branch_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Finds the earliest record of the branch that employees worked on
+        and that no product rate covers, such a record can not be paid.
+
+        Params
+            date_from: date obj - start of the period (included)
+            date_to: date obj - end of the period (included)
+            branch_id: 'Branch' id
+
+        Returns
+            Optional[Dict[str, Any]] - 'date' and 'product_name',
+                None if every record has a rate
+        """
+
+    @abstractmethod
+    async def salary_summary(
+        self, date_from: date, date_to: date, branch_id: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculates the salary of each employee of the branch for given period.
+        Every record is paid by the product rate in effect on its date and
+        shared equally between the employees who were on duty.
+        Records without a rate are not paid, check 'first_unrated_record' first.
+
+        Params
+            date_from: date obj - start of the period (included)
+            date_to: date obj - end of the period (included)
+            branch_id: 'Branch' id
+
+        Returns
+            List[Dict[str, Any]] - 'employee_id', 'first_name' and 'salary'
+        """
+
+    @abstractmethod
+    async def salary_details(
+        self, date_from: date, date_to: date, branch_id: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the records of the branch that employees worked on,
+        with the rate and the share of each employee.
+
+        Params
+            date_from: date obj - start of the period (included)
+            date_to: date obj - end of the period (included)
+            branch_id: 'Branch' id
+
+        Returns
+            List[Dict[str, Any]] - 'date', 'product_name', 'quantity', 'rate',
+                'emp_share' and 'employees' (first names), ordered by date.
+                'rate' is None if no rate covers the record's date
+        """
+
+    @abstractmethod
+    def stream_salary_details(
+        self,
+        date_from: date,
+        date_to: date,
+        branch_id: int,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        """
+        Same as 'salary_details', but reads the result through
+        a server-side cursor.
+
+        Params
+            date_from: date obj - start of the period (included)
+            date_to: date obj - end of the period (included)
+            branch_id: 'Branch' id
+            batch_size: max number of rows in one batch
+
+        Returns
+            AsyncIterator[Sequence[Dict[str, Any]]] - batches of rows
+        """
+
 
 class ProductionRecordRepository(IProductionRecordRepository):
     def __init__(
-        self, session: "sessionmaker[Session]", model: Type[ProductionRecord]
+        self, session: "async_sessionmaker[AsyncSession]", model: Type[ProductionRecord]
     ) -> None:
         super().__init__(session=session, model=model)
 
-    def create_record(self, new_record: ProductionRecord) -> ProductionRecord:
-        with self._session() as session:
+    async def create_record(self, new_record: ProductionRecord) -> ProductionRecord:
+        async with self._session() as session:
             session.add(new_record)
-            session.commit()
-            session.refresh(new_record)
+            await session.flush()
+            await add_production_totals(session, [new_record])
+            await session.commit()
+            await session.refresh(new_record)
 
         return new_record
 
-    def create_attendance_record(self, new_records: List[Attendance]) -> None:
-        with self._session() as session:
+    async def create_attendance_record(self, new_records: List[Attendance]) -> None:
+        async with self._session() as session:
             session.add_all(new_records)
 
-            session.commit()
+            await session.commit()
 
-    def stat(
-        self,
-        date_from: Optional[date] = None,
-        date_to: Optional[date] = None,
-    ) -> List[Dict[str, Any]]:
+    async def create_record_with_attendance(
+        self, new_record: ProductionRecord, employee_ids: Sequence[int]
+    ) -> ProductionRecord:
+        async with self._session() as session:
+            session.add(new_record)
+            await session.flush()  # INSERT ... RETURNING id
+
+            if employee_ids:
+                await session.execute(
+                    insert(Attendance).values(
+                        [
+                            {
+                                "employee_id": employee_id,
+                                "production_record_id": new_record.id,
+                            }
+                            for employee_id in employee_ids
+                        ]
+                    )
+                )
+
+            await add_production_totals(session, [new_record])
+            await session.commit()
+
+        return new_record
+
+    def _stat_stmt(self, date_from: Optional[date], date_to: Optional[date]):
         if date_to is None:
             date_to = date.today()
 
         if date_from is None:
             date_from = date(2000, 1, 1)
 
-        with self._session() as session:
-            select_stmt = (
-                select(
-                    Product.name,
-                    func.sum(self._model.quantity).label("total_count"),
-                    func.sum(self._model.used_cement_amount).label(
-                        "used_cement_amount"
-                    ),
-                )
-                .where(
-                    self._model.date >= date_from,
-                    self._model.date <= date_to,
-                )
-                .join(Product)
-                .group_by(self._model.product_id, Product.name)
-                .order_by(desc(text("total_count")))
+        return (
+            select(
+                Product.name,
+                func.sum(DailyProductTotal.produced_quantity).label("total_count"),
+                func.sum(DailyProductTotal.used_cement_amount).label(
+                    "used_cement_amount"
+                ),
             )
-            res = session.execute(select_stmt).mappings().all()
+            .where(
+                DailyProductTotal.date >= date_from,
+                DailyProductTotal.date <= date_to,
+            )
+            .join(Product)
+            .group_by(DailyProductTotal.product_id, Product.name)
+            .having(func.sum(DailyProductTotal.produced_quantity) > 0)
+            .order_by(desc(text("total_count")))
+        )
+
+    async def stat(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        async with self._session() as session:
+            select_stmt = self._stat_stmt(date_from=date_from, date_to=date_to)
+            res = (await session.execute(select_stmt)).mappings().all()
 
             return res  # type: ignore
 
-    def filter_by_period(
+    async def stream_stat(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        async with self._session() as session:
+            result = await session.stream(
+                self._stat_stmt(date_from=date_from, date_to=date_to),
+                execution_options={"yield_per": batch_size},
+            )
+            async for batch in result.mappings().partitions():
+                yield batch  # type: ignore
+
+    def _by_period_stmt(self, date_from: date, date_to: date, branch_id: Optional[int]):
+        stmt = select(self._model)
+        if branch_id:
+            stmt = stmt.where(
+                self._model.date >= date_from,
+                self._model.date <= date_to,
+                self._model.branch_id == branch_id,
+            )
+
+        else:
+            stmt = stmt.where(
+                self._model.date >= date_from, self._model.date <= date_to
+            )
+
+        return stmt.options(
+            selectinload(self._model.employees).selectinload(Attendance.employee),
+            selectinload(self._model.product),
+        ).order_by(self._model.date)
+
+    async def filter_by_period(
         self, date_from: date, date_to: date, branch_id: Optional[int] = None
     ) -> List[ProductionRecord]:
-        with self._session() as session:
-            stmt = select(self._model)
-            if branch_id:
-                stmt = stmt.where(
-                    self._model.date >= date_from,
-                    self._model.date <= date_to,
-                    self._model.branch_id == branch_id,
-                )
+        async with self._session() as session:
+            stmt = self._by_period_stmt(
+                date_from=date_from, date_to=date_to, branch_id=branch_id
+            )
+            results = (await session.execute(stmt)).scalars().all()
 
-            else:
-                stmt = stmt.where(
-                    self._model.date >= date_from, self._model.date <= date_to
-                )
+        return results  # type: ignore todo check what's wrong with this return type
 
-            stmt = stmt.options(
-                selectinload(self._model.employees).selectinload(Attendance.employee),
-                selectinload(self._model.product).selectinload(Product.rates),
-            ).order_by(self._model.date)  # todo fix tight coupling problem
+    async def stream_by_period(
+        self,
+        date_from: date,
+        date_to: date,
+        branch_id: Optional[int] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[ProductionRecord]]:
+        async with self._session() as session:
+            result = await session.stream(
+                self._by_period_stmt(
+                    date_from=date_from, date_to=date_to, branch_id=branch_id
+                ),
+                execution_options={"yield_per": batch_size},
+            )
+            async for batch in result.scalars().partitions():
+                yield batch
+
+    def _rate_in_effect(self):
+        """Payment rate of the record's product on the record's date"""
+        return rate_in_effect(self._model.product_id, self._model.date)
+
+    def _first_unrated_stmt(self, date_from: date, date_to: date, branch_id: int):
+        return (
+            select(self._model.date, Product.name.label("product_name"))
+            .join(Product, Product.id == self._model.product_id)
+            .where(
+                self._model.date >= date_from,
+                self._model.date <= date_to,
+                self._model.branch_id == branch_id,
+                self._rate_in_effect().is_(None),
+                select(Attendance.id)
+                .where(Attendance.production_record_id == self._model.id)
+                .exists(),
+            )
+            .order_by(self._model.date, self._model.id)
+            .limit(1)
+        )
+
+    async def first_unrated_record(
+        self, date_from: date, date_to: date, branch_id: int
+    ) -> Optional[Dict[str, Any]]:
+        stmt = self._first_unrated_stmt(
+            date_from=date_from, date_to=date_to, branch_id=branch_id
+        )
+
+        async with self._session() as session:
+            result = (await session.execute(stmt)).mappings().first()
+
+        return result  # type: ignore
+
+    def _salary_summary_stmt(self, date_from: date, date_to: date, branch_id: int):
+        crew_size = func.count().over(partition_by=Attendance.production_record_id)
+        shares = (
+            select(
+                Attendance.employee_id,
+                (self._rate_in_effect() * self._model.quantity / crew_size).label(
+                    "share"
+                ),
+            )
+            .join(self._model, self._model.id == Attendance.production_record_id)
+            .where(
+                self._model.date >= date_from,
+                self._model.date <= date_to,
+                self._model.branch_id == branch_id,
+            )
+            .subquery()
+        )
+        return (
+            select(
+                Employee.id.label("employee_id"),
+                Employee.first_name,
+                func.sum(shares.c.share).label("salary"),
+            )
+            .join(shares, shares.c.employee_id == Employee.id)
+            .group_by(Employee.id, Employee.first_name)
+            .order_by(Employee.first_name)
+        )
 
-            results = session.execute(stmt).scalars().all()
+    async def salary_summary(
+        self, date_from: date, date_to: date, branch_id: int
+    ) -> List[Dict[str, Any]]:
+        stmt = self._salary_summary_stmt(
+            date_from=date_from, date_to=date_to, branch_id=branch_id
+        )
+
+        async with self._session() as session:
+            results = (await session.execute(stmt)).mappings().all()
+
+        return results  # type: ignore
+
+    def _salary_details_stmt(self, date_from: date, date_to: date, branch_id: int):
+        rate = self._rate_in_effect()
+        return (
+            select(
+                self._model.date,
+                Product.name.label("product_name"),
+                self._model.quantity,
+                rate.label("rate"),
+                (rate * self._model.quantity / func.count(Attendance.id)).label(
+                    "emp_share"
+                ),
+                func.array_agg(Employee.first_name).label("employees"),
+            )
+            .join(Product, Product.id == self._model.product_id)
+            .join(Attendance, Attendance.production_record_id == self._model.id)
+            .join(Employee, Employee.id == Attendance.employee_id)
+            .where(
+                self._model.date >= date_from,
+                self._model.date <= date_to,
+                self._model.branch_id == branch_id,
+            )
+            .group_by(self._model.id, Product.name)
+            .order_by(self._model.date, self._model.id)
+        )
 
-        return results  # type: ignore todo check what's wrong with this return type
+    async def salary_details(
+        self, date_from: date, date_to: date, branch_id: int
+    ) -> List[Dict[str, Any]]:
+        stmt = self._salary_details_stmt(
+            date_from=date_from, date_to=date_to, branch_id=branch_id
+        )
+
+        async with self._session() as session:
+            results = (await session.execute(stmt)).mappings().all()
+
+        return results  # type: ignore
+
+    async def stream_salary_details(
+        self,
+        date_from: date,
+        date_to: date,
+        branch_id: int,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        stmt = self._salary_details_stmt(
+            date_from=date_from, date_to=date_to, branch_id=branch_id
+        )
+
+        async with self._session() as session:
+            result = await session.stream(
+                stmt, execution_options={"yield_per": batch_size}
+            )
+            async for batch in result.mappings().partitions():
+                yield batch  # type: ignore
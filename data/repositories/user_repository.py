@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from sqlalchemy import select
 
 from data.exceptions import RecordNotFound
 
@@ -15,7 +17,7 @@ class IUserRepository(ABC):
         self._model = model
 
     @abstractmethod
-    def create(self, new_user: User) -> User:
+    async def create(self, new_user: User) -> User:
         """
         Creates new user from given 'User' object.
 
@@ -27,7 +29,7 @@ class IUserRepository(ABC):
         """
 
     @abstractmethod
-    def get_by_id(self, user_id: int) -> User:
+    async def get_by_id(self, user_id: int) -> User:
         """
         Retrieves user by id.
 
@@ -42,23 +44,46 @@ class IUserRepository(ABC):
 
         """
 
+    @abstractmethod
+    async def get_credentials(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves only the fields needed to log the user in.
+
+        Params
+            user_id: int - User id
+
+        Returns
+            Dict[str, Any] - 'id' and 'first_name' of the user,
+                None if there is no user with user_id
+        """
+
 
 class UserRepository(IUserRepository):
 
-    def create(self, new_user: User) -> User:
-        with self._session() as session:
+    async def create(self, new_user: User) -> User:
+        async with self._session() as session:
             session.add(new_user)
-            session.commit()
+            await session.commit()
 
-            session.refresh(new_user)
+            await session.refresh(new_user)
 
         return new_user
 
-    def get_by_id(self, user_id: int) -> User:
-        with self._session() as session:
-            user = session.get(self._model, user_id)
+    async def get_by_id(self, user_id: int) -> User:
+        async with self._session() as session:
+            user = await session.get(self._model, user_id)
 
             if not user:
                 raise RecordNotFound(f'There is no user with id {user_id}')
 
             return user
+
+    async def get_credentials(self, user_id: int) -> Optional[Dict[str, Any]]:
+        stmt = select(self._model.id, self._model.first_name).where(
+            self._model.id == user_id
+        )
+
+        async with self._session() as session:
+            credentials = (await session.execute(stmt)).mappings().first()
+
+        return dict(credentials) if credentials else None
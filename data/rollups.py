@@ -0,0 +1,168 @@
+"""
+Maintenance of the 'daily_product_totals' rollup.
+
+The create paths of the repositories call 'add_production_totals' and
+'add_sales_totals' inside their own transaction, so the rollup is always
+in sync with the fact tables. Records and orders are never edited or
+deleted by the bot, a path that does it has to update the rollup too.
+Rows changed by hand in the database are not picked up, after that
+'rebuild_daily_totals' recomputes the rollup from scratch, run it with
+
+    python -m data.rollups
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from data.db import get_async_engine, get_async_sessionmaker
+from data.models import DailyProductTotal, Order, ProductionRecord
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+KEY_COLUMNS = ("date", "branch_id", "product_id")
+PRODUCTION_COLUMNS = ("produced_quantity", "used_cement_amount")
+SALES_COLUMNS = ("sold_quantity", "sold_amount")
+
+
+def _aggregate(
+    rows: Iterable[Dict[str, Any]], columns: Tuple[str, ...]
+) -> List[Dict[str, Any]]:
+    """
+    Sums rows with the same key, one statement can't update a row twice
+    """
+    totals: Dict[Tuple, Dict[str, Any]] = {}
+
+    for row in rows:
+        key = tuple(row[col] for col in KEY_COLUMNS)
+        total = totals.setdefault(
+            key, {**dict(zip(KEY_COLUMNS, key)), **{col: 0 for col in columns}}
+        )
+
+        for col in columns:
+            total[col] += row[col]
+
+    return list(totals.values())
+
+
+async def _add_totals(
+    session: AsyncSession, rows: Iterable[Dict[str, Any]], columns: Tuple[str, ...]
+) -> None:
+    values = _aggregate(rows, columns)
+    if not values:
+        return
+
+    stmt = insert(DailyProductTotal).values(values)
+    table = DailyProductTotal.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=KEY_COLUMNS,
+        set_={col: table.c[col] + stmt.excluded[col] for col in columns},
+    )
+
+    await session.execute(stmt)
+
+
+async def add_production_totals(
+    session: AsyncSession, records: Iterable[ProductionRecord]
+) -> None:
+    """
+    Adds production records to the rollup, the caller commits
+
+    Params
+        session: AsyncSession - session of the caller's transaction
+        records: inserted 'ProductionRecord' objects
+    """
+    rows = (
+        {
+            "date": record.date,
+            "branch_id": record.branch_id,
+            "product_id": record.product_id,
+            "produced_quantity": record.quantity,
+            "used_cement_amount": record.used_cement_amount,
+        }
+        for record in records
+    )
+
+    await _add_totals(session, rows, PRODUCTION_COLUMNS)
+
+
+async def add_sales_totals(
+    session: AsyncSession, orders: Iterable[Dict[str, Any]]
+) -> None:
+    """
+    Adds sales orders to the rollup, the caller commits
+
+    Params
+        session: AsyncSession - session of the caller's transaction
+        orders: fields of the inserted orders
+    """
+    rows = (
+        {
+            "date": order["date"],
+            "branch_id": order["branch_id"],
+            "product_id": order["product_id"],
+            "sold_quantity": order["quantity"],
+            "sold_amount": order["total_amount"],
+        }
+        for order in orders
+    )
+
+    await _add_totals(session, rows, SALES_COLUMNS)
+
+
+async def rebuild_daily_totals(session: AsyncSession) -> None:
+    """
+    Recomputes the whole rollup from production records and sales orders,
+    the caller commits
+    """
+    await session.execute(delete(DailyProductTotal))
+
+    produced = select(
+        ProductionRecord.date,
+        ProductionRecord.branch_id,
+        ProductionRecord.product_id,
+        func.sum(ProductionRecord.quantity),
+        func.sum(ProductionRecord.used_cement_amount),
+    ).group_by(
+        ProductionRecord.date, ProductionRecord.branch_id, ProductionRecord.product_id
+    )
+    await session.execute(
+        insert(DailyProductTotal).from_select(
+            [*KEY_COLUMNS, *PRODUCTION_COLUMNS], produced
+        )
+    )
+
+    sold = select(
+        Order.date,
+        Order.branch_id,
+        Order.product_id,
+        func.sum(Order.quantity),
+        func.sum(Order.total_amount),
+    ).group_by(Order.date, Order.branch_id, Order.product_id)
+    stmt = insert(DailyProductTotal).from_select([*KEY_COLUMNS, *SALES_COLUMNS], sold)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=KEY_COLUMNS,
+        set_={col: stmt.excluded[col] for col in SALES_COLUMNS},
+    )
+    await session.execute(stmt)
+
+
+async def _rebuild() -> None:
+    engine = get_async_engine()
+
+    try:
+        async with get_async_sessionmaker(engine)() as session:
+            await rebuild_daily_totals(session)
+            await session.commit()
+
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_rebuild())
@@ -5,8 +5,9 @@ from typing import TYPE_CHECKING
 from aiogram import F, Router
 from aiogram.filters import Command, CommandStart, or_f
 
+from config import settings
 from handlers.forms import ProductionRecordForm, SalesOrderForm
-from resources.string import BACK
+from resources.string import BACK, CATALOG_REFRESHED
 
 if TYPE_CHECKING:
     from re import Match
@@ -14,6 +15,9 @@ if TYPE_CHECKING:
     from aiogram.fsm.context import FSMContext
     from aiogram.types import CallbackQuery, Message
 
+    from data.repositories import (CachedBranchRepository,
+                                   CachedEmployeeRepository,
+                                   CachedProductRepository)
     from utils.state_manager import StateManager
 
 main_router = Router(name="main")
@@ -29,6 +33,23 @@ async def cmd_start(
     await state_mgr.dispatch_query(message=message, state=state, edit_msg=False)
 
 
+@main_router.message(Command("refresh"), F.from_user.id == settings.SUPER_ADMIN)
+async def refresh_catalog(
+    message: Message,
+    branch_repo: CachedBranchRepository,
+    product_repo: CachedProductRepository,
+    emp_repo: CachedEmployeeRepository,
+) -> None:
+    """
+    Branches, products and employees are edited in the database directly,
+    this drops what was cached from them
+    """
+    for repository in (branch_repo, product_repo, emp_repo):
+        repository.invalidate()
+
+    await message.answer(text=CATALOG_REFRESHED)
+
+
 @main_router.callback_query(F.data.regexp(r"activity_(\w+)").as_("activity_re"))
 async def start_record_adding(
     callback: CallbackQuery,
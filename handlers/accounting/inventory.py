@@ -47,5 +47,5 @@ async def show_balance(
 ):
     await callback.message.edit_text(CALCULATING)  # type: ignore
 
-    sold_products = order_repo.filter()
-    manufactured_products = prod_record_repo.stat()
+    sold_products = await order_repo.filter()
+    manufactured_products = await prod_record_repo.stat()
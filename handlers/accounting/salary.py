@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import calendar
 import datetime
 from typing import TYPE_CHECKING, Union
 
 from aiogram import F, Router
 from aiogram.filters import Command
-from aiogram.types import CallbackQuery, FSInputFile
+from aiogram.types import BufferedInputFile, CallbackQuery
 
+from data.exceptions import RateNotFound
 from handlers.generic import handler_registry
 from handlers.handler_manager.handler_manager import HandlerManager
 from resources.dicts import months
-from resources.string import CALCULATING_SALARY, NO_RECORDS, SALARY
-from utils.visualize import make_df, make_human_readable, to_pdf
+from resources.string import (
+    CALCULATING_SALARY,
+    NO_RATE,
+    NO_RECORDS,
+    REPORTS_BUSY,
+    SALARY,
+)
+from utils.renderer import ReportQueueFull
+from utils.visualize import make_df, make_df_from_batches, make_human_readable
 
 from .forms import AccountingForm, SalaryForm
 
@@ -23,6 +32,7 @@ if TYPE_CHECKING:
     from aiogram.types import Message
 
     from core.accounting import Accounting
+    from utils.renderer import ReportRenderer
     from utils.state_manager import StateManager
 
 salary_router = Router(name="salary")
@@ -68,7 +78,11 @@ async def select_branch(
     SalaryForm.period, F.data.regexp(r"month_(\d{1,2})").as_("month_re")
 )
 async def calculate_salary(
-    callback: CallbackQuery, state: FSMContext, month_re: Match, accounting: Accounting
+    callback: CallbackQuery,
+    state: FSMContext,
+    month_re: Match,
+    accounting: Accounting,
+    renderer: ReportRenderer,
 ) -> None:
     month = int(month_re.group(1))
     form_data = await state.get_value("form_data", {})
@@ -82,38 +96,68 @@ async def calculate_salary(
     msg = await callback.message.edit_text(  # type: ignore
         text=CALCULATING_SALARY.format(months[month])
     )
-    data = accounting.calculate_salary(branch_id=branch_id, period=period)
+    try:
+        summary = await accounting.salary_summary(branch_id=branch_id, period=period)
+
+        if not summary:
+            await callback.message.edit_text(text=NO_RECORDS)  # type: ignore
+            return
 
-    details = data["details"]
-    if not details:
-        await callback.message.edit_text(text=NO_RECORDS)  # type: ignore
+        df = await make_df_from_batches(
+            accounting.salary_details(branch_id=branch_id, period=period)
+        )
+
+    except RateNotFound as exc:
+        await callback.message.edit_text(  # type: ignore
+            text=NO_RATE.format(exc.product_name, f"{exc.date:%d.%m.%Y}")
+        )
         return
 
-    df = make_df(details)
     df = make_human_readable(df)
-    file_path, thumbnail_path = to_pdf(
-        title=f"Oylik {branch_id}-seh", df=df, period=period, figsize=(16, 10)
-    )
 
     df_summary = make_df(
         [
             {"Name": key, "Salary": int(round(value, -3))}
-            for key, value in data["summary"].items()
+            for key, value in summary.items()
         ]
     )  # todo clean the mess
     df_summary_sorted = df_summary.sort_values(
         by="Salary", ascending=True
     )  # todo find better way to put 'Total' at end of the table :)
     df_summary_sorted = make_human_readable(df_summary_sorted)
-    sum_file_path, sum_thumbnail_path = to_pdf(
-        title=f"Oylik {branch_id}-seh (Qisqacha)", df=df_summary_sorted, period=period
-    )
 
-    file = FSInputFile(file_path)
-    thumbnail = FSInputFile(thumbnail_path)
+    renders = [
+        asyncio.ensure_future(
+            renderer.to_table_pdf(title=f"Oylik {branch_id}-seh", df=df, period=period)
+        ),
+        asyncio.ensure_future(
+            renderer.to_pdf(
+                title=f"Oylik {branch_id}-seh (Qisqacha)",
+                df=df_summary_sorted,
+                period=period,
+            )
+        ),
+    ]
+    try:
+        report, summary_report = await asyncio.gather(*renders)
+
+    except ReportQueueFull:
+        await callback.message.edit_text(text=REPORTS_BUSY)  # type: ignore
+        return
 
-    sum_file = FSInputFile(sum_file_path)
-    sum_thumbnail = FSInputFile(sum_thumbnail_path)
+    finally:
+        # if one of the reports failed, the other one would hold
+        # its place in the queue of the renderer for nothing
+        for render in renders:
+            render.cancel()
+
+    file = BufferedInputFile(report.pdf, filename=report.file_name)
+    thumbnail = BufferedInputFile(report.thumbnail, filename="thumbnail.png")
+
+    sum_file = BufferedInputFile(summary_report.pdf, filename=summary_report.file_name)
+    sum_thumbnail = BufferedInputFile(
+        summary_report.thumbnail, filename="thumbnail.png"
+    )
 
     await callback.message.answer_document(document=file, thumbnail=thumbnail)  # type: ignore
     await callback.message.answer_document(  # type: ignore
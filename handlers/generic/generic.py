@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 from datetime import date
 from typing import TYPE_CHECKING
 
@@ -18,6 +17,7 @@ if TYPE_CHECKING:
     from aiogram.types import CallbackQuery, Message
     from aiogram_calendar import SimpleCalendarCallback
 
+    from utils.scheduler import DelayedTaskScheduler
     from utils.state_manager import StateManager
 
 handler_registry = HandlerRegistry()
@@ -122,6 +122,7 @@ async def process_date(
     state: FSMContext,
     callback_data: SimpleCalendarCallback,
     state_mgr: StateManager,
+    scheduler: DelayedTaskScheduler,
     var_name: str,
     next_state: State,
 ) -> None:
@@ -134,6 +135,7 @@ async def process_date(
         :param state: 'FSMContext' instance, injected by dispatcher
         :param callback_data: 'SimpleCalendarCallback' object, injected by dispatcher
         :param state_mgr: StateManager object, injected by dispatcher
+        :param scheduler: DelayedTaskScheduler object, injected by dispatcher
         :param var_name: variable name to retrieve it later,
                 injected by HandlerManager during registration
         :param next_state: next state to be set, injected by HandlerManager during registration
@@ -153,7 +155,6 @@ async def process_date(
         else:
             if event.message:
                 msg = await event.message.answer(text=CANT_SELECT_FUTURE_DATE)
-                await asyncio.sleep(1)
-                await msg.delete()
+                scheduler.delete_later(msg, delay=1)
 
         await state_mgr.dispatch_query(message=event.message, state=state)  # type: ignore
@@ -1,19 +1,12 @@
 from __future__ import annotations
 
-import inspect
-from functools import wraps
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
 
 from aiogram import Router
 
 if TYPE_CHECKING:
-    from re import Match
-
-    from aiogram.fsm.context import FSMContext
-    from aiogram.types import TelegramObject
-
     from handlers.generic import HandlerRegistry
-    from utils.state_manager import StateManager
 
 
 class HandlerManager:
@@ -37,28 +30,9 @@ class HandlerManager:
         handler_info = self._handler_registry[handler_name]
         handler = handler_info["handler"]
 
-        @wraps(handler)
-        async def new_handler(
-            event: TelegramObject,
-            state: FSMContext,
-            state_mgr: StateManager,
-            regex_res: Optional[Match] = None,
-            callback_data=None,
-        ):
-            args = inspect.getfullargspec(handler).args
-            kwargs = {
-                "event": event,
-                "state": state,
-                "state_mgr": state_mgr,
-                "callback_data": callback_data,
-                "regex_res": regex_res,
-            }
-            kwargs.update()
-            kwargs = {k: kwargs[k] for k in args if k in kwargs}
-
-            return await handler(var_name=var_name, next_state=next_state, **kwargs)
-
-        return new_handler
+        # aiogram resolves the signature of the partial once, at registration,
+        # and calls it with the event and only the arguments the handler takes
+        return partial(handler, var_name=var_name, next_state=next_state)
 
     def create_handler(self, field_info: Dict[str, Any]) -> None:
         filters = field_info["filters"]
@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from config import settings
+from utils.rate_limiter import low_priority
 
 if TYPE_CHECKING:
     from aiogram import Bot
@@ -13,4 +14,5 @@ if TYPE_CHECKING:
 
 
 async def send_message_to_admin(bot: Bot, context: str):
-    await bot.send_message(settings.SUPER_ADMIN, context)
+    with low_priority():
+        await bot.send_message(settings.SUPER_ADMIN, context)
@@ -6,13 +6,14 @@ from typing import TYPE_CHECKING, Any, Dict, List
 from aiogram import F, Router
 from aiogram_calendar import SimpleCalendar, SimpleCalendarCallback
 
-from config import settings
-from data.models import Attendance, ProductionRecord
+from data.models import ProductionRecord
 from handlers.forms import ProductionRecordForm
 from handlers.generic import handler_registry
 from handlers.handler_manager import HandlerManager
-from keyboards import save_kb
+from handlers.notifications import send_message_to_admin
+from keyboards import save_kb, toggle_worker_btn, workers_on_duty_kb
 from resources.string import READY, SAVE, SUCCESSFULLY_SAVED
+from utils.roster import WorkerRoster
 
 if TYPE_CHECKING:
     from re import Match
@@ -24,6 +25,7 @@ if TYPE_CHECKING:
     from data.repositories import (IBranchRepository,
                                    IProductionRecordRepository,
                                    IProductRepository)
+    from utils.report_cache import ReportCache
     from utils.state_manager import StateManager
 
 
@@ -90,23 +92,59 @@ async def process_workers(
     worker_id_re: Match,
     state_mgr: StateManager,
 ) -> None:
-    """Processes the workers on duty"""
+    """
+    Processes the workers on duty.
+    Only the button of the worker is changed, the rest of the
+    message stays as it is.
+    """
     worker_id = int(worker_id_re.group(1))
 
     extras = await state.get_value("extras", {})
-    present_employees = extras.get("present_employees", set())
+    roster = WorkerRoster(*extras["roster"])
+
+    try:
+        roster = roster.toggle(worker_id)
+
+    except ValueError:  # a button of a stale keyboard
+        return
+
+    extras.update(roster=roster)
+    await state.update_data(extras=extras)
 
-    if worker_id in present_employees:
-        present_employees.remove(worker_id)
+    markup = getattr(callback.message, "reply_markup", None)
+    if markup is not None:
+        first_name, on_duty = roster.status(worker_id)
+        markup = toggle_worker_btn(markup, worker_id, first_name, on_duty)
 
-    else:
-        present_employees.add(worker_id)
+    if markup is None:
+        await state_mgr.dispatch_query(
+            message=callback.message,  # type: ignore
+            state=state,
+        )
+        return
+
+    await callback.message.edit_reply_markup(reply_markup=markup)  # type: ignore
+
+
+@production_router.callback_query(
+    ProductionRecordForm.workers,
+    F.data.regexp(r"^workers_page_(\d+)$").as_("page_re"),
+)
+async def change_workers_page(
+    callback: CallbackQuery,
+    state: FSMContext,
+    page_re: Match,
+) -> None:
+    """Shows another page of the workers"""
+    page = int(page_re.group(1))
 
-    await state.update_data(present_employees=present_employees)
+    extras = await state.get_value("extras", {})
+    extras.update(workers_page=page)
+    await state.update_data(extras=extras)
 
-    await state_mgr.dispatch_query(
-        message=callback.message,  # type: ignore
-        state=state,
+    roster = WorkerRoster(*extras["roster"])
+    await callback.message.edit_reply_markup(  # type: ignore
+        reply_markup=workers_on_duty_kb(roster=roster, page=page)
     )
 
 
@@ -128,13 +166,13 @@ async def show_summary(
 
     form_data = data.get("form_data", {})
     extras = data.get("extras", {})
-    present_employees = extras.get("present_employees", set())
+    roster = WorkerRoster(*extras["roster"])
 
-    message = summary_message(
+    message = await summary_message(
         data=form_data,
         branch_repo=branch_repo,
         product_repo=product_repo,
-        present_employees=present_employees,
+        present_employees=roster.present_ids(),
     )
     extras.update(message=message)
     await state.update_data(extras=extras)
@@ -148,33 +186,38 @@ async def save_to_db(
     bot: Bot,
     state: FSMContext,
     prod_record_repo: IProductionRecordRepository,
+    report_cache: ReportCache,
 ):
     data = await state.get_data()
     await state.update_data(form_data={}, state_stack=[])
     await state.set_state()
 
     form_data = data["form_data"]
-    present_employees = data["extras"]["present_employees"]
+    roster = WorkerRoster(*data["extras"]["roster"])
     message = data["extras"]["message"]
-    _save_to_db(
+    await _save_to_db(
         repository=prod_record_repo,
         form_data=form_data,
-        workers=present_employees,
+        workers=roster.present_ids(),
     )
-    await bot.send_message(settings.SUPER_ADMIN, text=message)
+    report_cache.invalidate(
+        day=datetime.strptime(form_data["date"], "%Y-%m-%d").date(),
+        branch_id=form_data["branch_id"],
+    )
+    await send_message_to_admin(bot=bot, context=message)
     await callback.message.edit_text(text=message)  # type: ignore
     await callback.message.answer(text=SUCCESSFULLY_SAVED)  # type: ignore
 
 
-def summary_message(
+async def summary_message(
     data: Dict[str, Any],
     present_employees: List[int],
     branch_repo: IBranchRepository,
     product_repo: IProductRepository,
 ):
     message = "<b>Ishlab chiqarish</b>\n\n"
-    branch = branch_repo.get_by_id(data["branch_id"])
-    product = product_repo.get_by_id(data["product_id"])
+    branch = await branch_repo.get_by_id(data["branch_id"])
+    product = await product_repo.get_by_id(data["product_id"])
     date = datetime.strptime(data["date"], "%Y-%m-%d").strftime("%d.%m.%Y")
 
     message += f"Bo'lim nomi: <blockquote>{branch.name}</blockquote>\n"
@@ -187,19 +230,15 @@ def summary_message(
     return message
 
 
-def _save_to_db(
+async def _save_to_db(
     repository: IProductionRecordRepository,
     form_data: Dict[str, Any],
     workers: List[int],
 ) -> None:
-    new_record_obj = ProductionRecord(**form_data)
-
-    new_inserted_record = repository.create_record(new_record=new_record_obj)
-
-    attendance_records = []
-    for worker in workers:
-        attendance_records.append(
-            Attendance(employee_id=worker, production_record_id=new_inserted_record.id)
-        )
+    new_record_obj = ProductionRecord(
+        **{**form_data, "date": datetime.strptime(form_data["date"], "%Y-%m-%d").date()}
+    )
 
-        repository.create_attendance_record(new_records=attendance_records)
+    await repository.create_record_with_attendance(
+        new_record=new_record_obj, employee_ids=workers
+    )
@@ -2,19 +2,18 @@ from __future__ import annotations
 
 from datetime import datetime
 from re import Match
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram_calendar import SimpleCalendar, SimpleCalendarCallback
 
-from data.models import Order
 from handlers.forms import SalesOrderForm
 from handlers.generic import handler_registry
 from handlers.handler_manager.handler_manager import HandlerManager
 from handlers.notifications import send_message_to_admin
 from keyboards import save_kb
-from resources.string import ADD_PRODUCT, SAVE, SUCCESSFULLY_SAVED
+from resources.string import ADD_PRODUCT, SAVE, SUCCESSFULLY_SAVED, TOTAL
 from utils.state_manager import StateManager
 
 if TYPE_CHECKING:
@@ -23,6 +22,7 @@ if TYPE_CHECKING:
 
     from data.repositories import (IBranchRepository, IOrderRepository,
                                    IProductRepository)
+    from utils.report_cache import ReportCache
 
 
 sales_router = Router(name="sales")
@@ -85,7 +85,7 @@ async def show_summary(
     form_data["price"] = price
     form_data["total_amount"] = price * form_data["quantity"]
 
-    summary_msg = new_record_details(
+    summary_msg = await new_record_details(
         new_record=form_data, branch_repo=branch_repo, product_repo=product_repo
     )
     await state.update_data(form_data=form_data, message=summary_msg)
@@ -95,32 +95,55 @@ async def show_summary(
 
 @sales_router.callback_query(SalesOrderForm.save, F.data == SAVE)
 async def save_to_db(
-    callback: CallbackQuery, bot: Bot, state: FSMContext, order_repo: IOrderRepository
+    callback: CallbackQuery,
+    bot: Bot,
+    state: FSMContext,
+    order_repo: IOrderRepository,
+    report_cache: ReportCache,
 ) -> None:
     data = await state.get_data()
-    form_data = data.get("form_data", {})
-    orders = data.get("orders", [])
-    message = await state.get_value("message", "")
-    await state.update_data(form_data={}, state_stack=[], orders=[])
+    orders = data.get("orders", []) + [data.get("form_data", {})]
+    messages = data.get("messages", []) + [data.get("message", "")]
+    await state.update_data(form_data={}, state_stack=[], orders=[], messages=[])
     await state.set_state()
 
-    # Save to db
-    if orders:
-        for order in orders:
-            _save_to_db(new_record=order, order_repo=order_repo)
-            await send_message_to_admin(bot=bot, context=message)
+    await _save_to_db(new_records=orders, order_repo=order_repo)
+    for order in orders:
+        report_cache.invalidate(
+            day=datetime.strptime(order["date"], "%Y-%m-%d").date(),
+            branch_id=order["branch_id"],
+        )
 
-    _save_to_db(new_record=form_data, order_repo=order_repo)
+    message = sale_message(orders=orders, messages=messages)
     await send_message_to_admin(bot=bot, context=message)
 
     await callback.message.edit_text(text=message)  # type: ignore
     await callback.message.answer(text=SUCCESSFULLY_SAVED)  # type: ignore
 
 
-def _save_to_db(new_record: Dict[str, Any], order_repo: IOrderRepository) -> None:
-    new_order = Order(**new_record)
+async def _save_to_db(
+    new_records: List[Dict[str, Any]], order_repo: IOrderRepository
+) -> None:
+    new_orders = [
+        {
+            **new_record,
+            "date": datetime.strptime(new_record["date"], "%Y-%m-%d").date(),
+        }
+        for new_record in new_records
+    ]
+
+    await order_repo.create_many(new_orders)
+
+
+def sale_message(orders: List[Dict[str, Any]], messages: List[str]) -> str:
+    """Combines the summaries of all order lines into one message"""
+    msg = "\n".join(messages)
 
-    order_repo.create_new(new_order)
+    if len(orders) > 1:
+        total_amount = sum(order["total_amount"] for order in orders)
+        msg += f"\n<b>{TOTAL}:</b> <blockquote>{total_amount:,} so'm</blockquote>\n"
+
+    return msg
 
 
 @sales_router.callback_query(SalesOrderForm.save, F.data == ADD_PRODUCT)
@@ -129,22 +152,23 @@ async def add_more(
 ) -> None:
     data = await state.get_data()
     orders = data.get("orders", [])
-    new_record = data.get("form_data", {})
-    orders.append(new_record)
+    messages = data.get("messages", [])
+    orders.append(data.get("form_data", {}))
+    messages.append(data.get("message", ""))
 
-    await state.update_data(orders=orders)
+    await state.update_data(orders=orders, messages=messages)
     await state_mgr.push_state_stack(state, SalesOrderForm.product_id)
     await state_mgr.dispatch_query(message=callback.message, state=state)  # type: ignore
 
 
-def new_record_details(
+async def new_record_details(
     new_record: Dict[str, Any],
     branch_repo: IBranchRepository,
     product_repo: IProductRepository,
 ) -> str:
     msg = "<b>Sotuv</b>\n\n"
-    branch = branch_repo.get_by_id(branch_id=new_record["branch_id"])
-    product = product_repo.get_by_id(product_id=new_record["product_id"])
+    branch = await branch_repo.get_by_id(branch_id=new_record["branch_id"])
+    product = await product_repo.get_by_id(product_id=new_record["product_id"])
     date = datetime.strptime(new_record["date"], "%Y-%m-%d").strftime("%d.%m.%Y")
 
     msg += f"Bo'lim: <blockquote>{branch.name}</blockquote>\n"
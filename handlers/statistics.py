@@ -1,28 +1,33 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Tuple
 
 import pandas as pd
 from aiogram import F, Router
 from aiogram.filters import Command
-from aiogram.types import FSInputFile
+from aiogram.types import BufferedInputFile
 
 from handlers.generic import handler_registry
 from handlers.handler_manager.handler_manager import HandlerManager
-from resources.string import PREPARING_REPORT, REPORT_READY, TOTAL
+from resources.string import PREPARING_REPORT, REPORT_READY, REPORTS_BUSY, TOTAL
+from utils.renderer import ReportQueueFull
+from utils.report_cache import CachedReport, ReportCache
 from utils.state_manager import StateManager
 from utils.stats import get_period
-from utils.visualize import make_df, make_human_readable, to_pdf
+from utils.visualize import make_df, make_df_from_batches, make_human_readable
 
 from .forms import StatisticsForm
 
 if TYPE_CHECKING:
+    from datetime import date
     from re import Match
 
     from aiogram.fsm.context import FSMContext
     from aiogram.types import CallbackQuery, Message
+    from pandas import DataFrame
 
     from data.repositories import IOrderRepository, IProductionRecordRepository
+    from utils.renderer import ReportRenderer
 
 stat_router = Router(name="statistics")
 
@@ -43,7 +48,6 @@ _handler_mgr.include_registry(handler_registry)
 _handler_mgr.create_handlers(STATISTICSFORM)
 
 
-
 @stat_router.message(Command("stats"))
 async def select_activity(
     message: Message,
@@ -63,6 +67,8 @@ async def show_report(
     state: FSMContext,
     prod_record_repo: IProductionRecordRepository,
     order_repo: IOrderRepository,
+    renderer: ReportRenderer,
+    report_cache: ReportCache,
     period_re: Match,
 ) -> None:
     period_title = period_re.group(1)
@@ -70,24 +76,65 @@ async def show_report(
 
     form_data = await state.get_value("form_data", {})
     activity = form_data.get("activity", "")
+
+    key = ReportCache.make_key(kind=activity, period=period)
+    cached = report_cache.get(key)
+
+    if cached is None:
+        title, df = await _report_data(
+            activity=activity,
+            period=period,
+            prod_record_repo=prod_record_repo,
+            order_repo=order_repo,
+        )
+        fingerprint = ReportCache.fingerprint(key, df)
+        cached = report_cache.find(fingerprint)
+
+        if cached is None:
+            try:
+                report = await renderer.to_pdf(
+                    df=df, title=title, period=period, figsize=(12, 4)
+                )
+
+            except ReportQueueFull:
+                await callback.message.edit_text(text=REPORTS_BUSY)  # type: ignore
+                return
+
+            cached = CachedReport(report=report)
+
+        report_cache.put(key, fingerprint, cached)
+
+    msg = await callback.message.edit_text(text=PREPARING_REPORT)  # type: ignore
+    await _send_report(message=callback.message, cached=cached)  # type: ignore
+    await msg.delete()  # type: ignore
+    await callback.message.answer(text=REPORT_READY)  # type: ignore
+
+
+async def _report_data(
+    activity: str,
+    period: Dict[str, date],
+    prod_record_repo: IProductionRecordRepository,
+    order_repo: IOrderRepository,
+) -> Tuple[str, DataFrame]:
+    """Returns the title and the table of the report"""
     title = "Ishlab chiqarish"
     headers = ["Nomi", "Soni"]
     col_order = ["name", "total_count"]
-    result = []
 
-    if activity == "production":
-
-        result = prod_record_repo.stat(**period)
-        headers.append("Ishlatilgan sement")
-        col_order.append("used_cement_amount")
-
-    elif activity == "sales":
+    if activity == "sales":
         title = "Sotuv"
-        result = order_repo.filter(**period)
+        batches = order_repo.stream_filter(**period)
         col_order.append("total_amount")
         headers.append("Summa")
 
-    df = make_df(data=result, col_order=col_order, column_names=headers, sort_by="Soni")
+    else:
+        batches = prod_record_repo.stream_stat(**period)
+        headers.append("Ishlatilgan sement")
+        col_order.append("used_cement_amount")
+
+    df = await make_df_from_batches(
+        batches=batches, col_order=col_order, column_names=headers, sort_by="Soni"
+    )
 
     if activity == "sales":
 
@@ -96,15 +143,19 @@ async def show_report(
         )
         df = pd.concat([df, total_row])
 
-    df = make_human_readable(df=df)
-    report_pdf_path, thumbnail_path = to_pdf(
-        df=df, title=title, period=period, figsize=(12, 4)
-    )
+    return title, make_human_readable(df=df)
 
-    file = FSInputFile(report_pdf_path)
-    thumbnail = FSInputFile(thumbnail_path)
 
-    msg = await callback.message.edit_text(text=PREPARING_REPORT)  # type: ignore
-    await callback.message.answer_document(file, thumbnail=thumbnail)  # type: ignore
-    await msg.delete()  # type: ignore
-    await callback.message.answer(text=REPORT_READY)  # type: ignore
+async def _send_report(message: Message, cached: CachedReport) -> None:
+    """Sends the report by its file id if it was uploaded before"""
+    if cached.file_id:
+        await message.answer_document(cached.file_id)
+        return
+
+    report = cached.report
+    file = BufferedInputFile(report.pdf, filename=report.file_name)
+    thumbnail = BufferedInputFile(report.thumbnail, filename="thumbnail.png")
+
+    sent = await message.answer_document(file, thumbnail=thumbnail)
+    if sent.document:
+        cached.file_id = sent.document.file_id
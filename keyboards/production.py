@@ -1,17 +1,27 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from aiogram.types import InlineKeyboardMarkup
 from aiogram_calendar import SimpleCalendar
 
 from keyboards.common import back_kb
-from resources.string import ADD_PRODUCT, CALLBACK_DATA, READY, SAVE, TEXT
+from resources.string import (
+    ADD_PRODUCT,
+    CALLBACK_DATA,
+    NEXT_PAGE,
+    PREVIOUS_PAGE,
+    READY,
+    SAVE,
+    TEXT,
+)
 from utils.keyboard import make_inline_kb
 
 if TYPE_CHECKING:
-    from aiogram.types import InlineKeyboardMarkup
+    from utils.roster import WorkerRoster
 
-    from data.models import Employee
+# telegram does not handle long keyboards well, 10 rows of 2 workers
+WORKERS_PER_PAGE = 20
 
 
 def branches_kb(branches: List[Dict[str, Any]]) -> InlineKeyboardMarkup:
@@ -50,27 +60,73 @@ def products_kb(products: List[Dict[str, Any]]) -> InlineKeyboardMarkup:
     return make_inline_kb(buttons, back_btn=True, size=[2], resize=False)
 
 
-def workers_on_duty_kb(
-    workers: Sequence[Employee], present_employees: Set[int]
-) -> InlineKeyboardMarkup:
-    """Shows selected branch workers"""
+def _worker_btn_text(first_name: str, on_duty: bool) -> str:
+    if on_duty:
+        return f"✅ {first_name}"
+
+    return f"❌ {first_name}"
+
+
+def workers_on_duty_kb(roster: WorkerRoster, page: int = 0) -> InlineKeyboardMarkup:
+    """Shows selected branch workers, 'WORKERS_PER_PAGE' at a time"""
+
+    pages = max(1, -(-len(roster.ids) // WORKERS_PER_PAGE))
+    page = min(max(page, 0), pages - 1)
+    start = page * WORKERS_PER_PAGE
+    workers = list(roster.workers())[start : start + WORKERS_PER_PAGE]
 
     buttons = []
-    for worker in workers:
+    for worker_id, first_name, on_duty in workers:
         btn = {}
-        worker_id = worker.id
-        if worker_id in present_employees:
-            btn[TEXT] = f"✅ {worker.first_name}"
-        else:
-            btn[TEXT] = f"❌ {worker.first_name}"
-
+        btn[TEXT] = _worker_btn_text(first_name, on_duty)
         btn[CALLBACK_DATA] = f"worker_{worker_id}"
         buttons.append(btn)
 
+    size = [2] * (len(workers) // 2) + [1] * (len(workers) % 2)
+
+    nav = []
+    if page > 0:
+        nav.append({TEXT: PREVIOUS_PAGE, CALLBACK_DATA: f"workers_page_{page - 1}"})
+
+    if page < pages - 1:
+        nav.append({TEXT: NEXT_PAGE, CALLBACK_DATA: f"workers_page_{page + 1}"})
+
+    if nav:
+        buttons.extend(nav)
+        size.append(len(nav))
+
     ready_btn = {TEXT: READY, CALLBACK_DATA: READY}
     buttons.append(ready_btn)
+    size.append(1)
+
+    # every toggle makes a new keyboard, not worth caching
+    return make_inline_kb(buttons=buttons, size=size, back_btn=True, cache=False)
+
+
+def toggle_worker_btn(
+    markup: InlineKeyboardMarkup, worker_id: int, first_name: str, on_duty: bool
+) -> Optional[InlineKeyboardMarkup]:
+    """
+    Returns a copy of the attendance keyboard with only the button
+    of the worker changed, None if the keyboard has no such button
+    """
+    callback_data = f"worker_{worker_id}"
+
+    for i, row in enumerate(markup.inline_keyboard):
+        for j, btn in enumerate(row):
+            if btn.callback_data != callback_data:
+                continue
+
+            new_row = list(row)
+            new_row[j] = btn.model_copy(
+                update={TEXT: _worker_btn_text(first_name, on_duty)}
+            )
+            rows = list(markup.inline_keyboard)
+            rows[i] = new_row
+
+            return InlineKeyboardMarkup(inline_keyboard=rows)
 
-    return make_inline_kb(buttons=buttons, size=[2], back_btn=True)
+    return None
 
 
 def save_kb(add_extra: bool = False) -> InlineKeyboardMarkup:
@@ -8,10 +8,14 @@ from aiogram.enums.parse_mode import ParseMode
 
 from config import settings
 from core.accounting import Accounting
-from data.db import get_engine, get_sessionmaker
+from data.db import get_async_engine, get_async_sessionmaker
 from data.models import Branch, Employee, Order, Product, ProductionRecord, User
 from data.repositories import (
     BranchRepository,
+    CachedBranchRepository,
+    CachedEmployeeRepository,
+    CachedProductRepository,
+    CachedUserRepository,
     EmployeeRepository,
     OrderRepository,
     ProductionRecordRepository,
@@ -28,14 +32,48 @@ from handlers import (
 )
 from query_handlers import accounting_switch, inv_switch, switch
 from utils import StateManager
+from utils.cache import TTLCache
+from utils.fsm_storage import SQLiteStorage, StorageFlushMiddleware
+from utils.keyboard import invalidate_keyboards
+from utils.rate_limiter import RateLimitMiddleware
+from utils.renderer import ReportRenderer
+from utils.report_cache import ReportCache
+from utils.scheduler import DelayedTaskScheduler
+from utils.throttling import ThrottlingMiddleware
+from utils.webhook import run_webhook
 
 
 async def main() -> None:
     bot = Bot(
         settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
+    bot.session.middleware(RateLimitMiddleware(chat_interval=settings.RATE_LIMIT))
 
-    dp = Dispatcher()
+    storage = SQLiteStorage(path=settings.FSM_STORAGE_PATH, ttl=settings.FSM_STATE_TTL)
+    dp = Dispatcher(storage=storage)
+    dp.update.outer_middleware(StorageFlushMiddleware(storage))
+
+    throttling = ThrottlingMiddleware(
+        window=settings.DEBOUNCE_WINDOW,
+        max_in_flight=settings.MAX_UPDATES_IN_FLIGHT,
+        max_queued=settings.MAX_UPDATES_QUEUED,
+    )
+    dp.message.outer_middleware(throttling)
+    dp.callback_query.outer_middleware(throttling)
+
+    scheduler = DelayedTaskScheduler()
+    dp.startup.register(scheduler.start)
+    dp.shutdown.register(scheduler.stop)
+
+    renderer = ReportRenderer(
+        workers=settings.REPORT_WORKERS,
+        queue_size=settings.REPORT_QUEUE_SIZE,
+        max_tasks_per_worker=settings.REPORT_WORKER_MAX_TASKS,
+    )
+    dp.shutdown.register(renderer.close)
+    report_cache = ReportCache(
+        ttl=settings.REPORT_CACHE_TTL, maxsize=settings.REPORT_CACHE_SIZE
+    )
 
     # register routers
     dp.include_routers(
@@ -50,16 +88,34 @@ async def main() -> None:
     dp.include_router(unhandled_router)
 
     # Initialize dependencies
-    engine = get_engine(settings.database_url_psycopg2)
-    sessionmaker_factory = get_sessionmaker(engine)
+    engine = get_async_engine(settings.database_url)
+    sessionmaker_factory = get_async_sessionmaker(engine)
     prod_record_repo = ProductionRecordRepository(
         session=sessionmaker_factory, model=ProductionRecord
     )
-    emp_repo = EmployeeRepository(session=sessionmaker_factory, model=Employee)
-    branch_repo = BranchRepository(session=sessionmaker_factory, model=Branch)
-    product_repo = ProductRepository(session=sessionmaker_factory, model=Product)
+    # keyboards are built from the catalog, drop them when it changes
+    catalog_listeners = [invalidate_keyboards]
+    emp_repo = CachedEmployeeRepository(
+        repository=EmployeeRepository(session=sessionmaker_factory, model=Employee),
+        cache=TTLCache(settings.CATALOG_CACHE_TTL, settings.CATALOG_CACHE_SIZE),
+        listeners=catalog_listeners,
+    )
+    branch_repo = CachedBranchRepository(
+        repository=BranchRepository(session=sessionmaker_factory, model=Branch),
+        cache=TTLCache(settings.CATALOG_CACHE_TTL, settings.CATALOG_CACHE_SIZE),
+        listeners=catalog_listeners,
+    )
+    product_repo = CachedProductRepository(
+        repository=ProductRepository(session=sessionmaker_factory, model=Product),
+        cache=TTLCache(settings.CATALOG_CACHE_TTL, settings.CATALOG_CACHE_SIZE),
+        listeners=catalog_listeners,
+    )
     order_repo = OrderRepository(session=sessionmaker_factory, model=Order)
-    user_repo = UserRepository(session=sessionmaker_factory, model=User)
+    user_repo = CachedUserRepository(
+        repository=UserRepository(session=sessionmaker_factory, model=User),
+        cache=TTLCache(settings.AUTH_CACHE_TTL, settings.AUTH_CACHE_SIZE),
+        negative_ttl=settings.AUTH_CACHE_NEGATIVE_TTL,
+    )
 
     state_mgr = StateManager(
         prod_record_repo=prod_record_repo,
@@ -79,17 +135,46 @@ async def main() -> None:
         prod_record_repo=prod_record_repo,
     )
 
-    await dp.start_polling(
-        bot,
+    workflow_data = dict(
         prod_record_repo=prod_record_repo,
+        emp_repo=emp_repo,
         branch_repo=branch_repo,
         product_repo=product_repo,
         order_repo=order_repo,
         user_repo=user_repo,
         accounting=accounting,
         state_mgr=state_mgr,
+        scheduler=scheduler,
+        renderer=renderer,
+        report_cache=report_cache,
     )
 
+    try:
+        if settings.WEBHOOK_URL:
+            await run_webhook(
+                dp,
+                bot,
+                base_url=settings.WEBHOOK_URL,
+                path=settings.WEBHOOK_PATH,
+                host=settings.WEBAPP_HOST,
+                port=settings.WEBAPP_PORT,
+                max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                concurrency_limit=settings.UPDATES_CONCURRENCY,
+                secret_token=settings.WEBHOOK_SECRET,
+                **workflow_data,
+            )
+
+        else:
+            await bot.delete_webhook()
+            await dp.start_polling(
+                bot,
+                tasks_concurrency_limit=settings.UPDATES_CONCURRENCY,
+                **workflow_data,
+            )
+    finally:
+        await storage.close()
+        await engine.dispose()
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, stream=sys.stdout)
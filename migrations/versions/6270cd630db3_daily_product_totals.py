@@ -0,0 +1,82 @@
+"""daily product totals
+
+Rollup of production records and sales orders per (date, branch, product),
+the statistics reports read from it. Backfilled from the fact tables,
+'python -m data.rollups' rebuilds it later if needed.
+
+Revision ID: 6270cd630db3
+Revises: 87dc572555ec
+Create Date: 2026-10-18 18:51:20.650896
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6270cd630db3"
+down_revision: Union[str, None] = "87dc572555ec"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_product_totals",
+        sa.Column("date", sa.DATE(), nullable=False),
+        sa.Column("branch_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "produced_quantity",
+            sa.BIGINT(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.Column(
+            "used_cement_amount",
+            sa.Float(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.Column(
+            "sold_quantity", sa.BIGINT(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "sold_amount", sa.BIGINT(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("current_timestamp"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["branch_id"], ["branches.id"]),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("date", "branch_id", "product_id"),
+    )
+
+    op.execute("""
+        INSERT INTO daily_product_totals
+            (date, branch_id, product_id, produced_quantity, used_cement_amount)
+        SELECT date, branch_id, product_id, sum(quantity), sum(used_cement_amount)
+        FROM production_records
+        GROUP BY date, branch_id, product_id
+        """)
+    op.execute("""
+        INSERT INTO daily_product_totals
+            (date, branch_id, product_id, sold_quantity, sold_amount)
+        SELECT date, branch_id, product_id, sum(quantity), sum(total_amount)
+        FROM sales_orders
+        GROUP BY date, branch_id, product_id
+        ON CONFLICT (date, branch_id, product_id) DO UPDATE
+        SET sold_quantity = excluded.sold_quantity,
+            sold_amount = excluded.sold_amount
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_product_totals")
@@ -0,0 +1,52 @@
+"""report indexes
+
+Indexes for the queries of the salary reports:
+    ix_production_records_branch_id_date - salary summary, salary details
+        and unrated records of a branch for a period
+    ix_attendance_production_record_id - crews of the records in the
+        salary queries
+    ix_attendance_employee_id - foreign key checks when an employee
+        is deleted
+
+The statistics reports read 'daily_product_totals' (6270cd630db3),
+its primary key serves their date range.
+
+Revision ID: 87dc572555ec
+Revises: aba1a120f97a
+Create Date: 2026-10-18 18:49:49.694295
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "87dc572555ec"
+down_revision: Union[str, None] = "aba1a120f97a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    (
+        "ix_production_records_branch_id_date",
+        "production_records",
+        ["branch_id", "date"],
+    ),
+    ("ix_attendance_production_record_id", "attendance", ["production_record_id"]),
+    ("ix_attendance_employee_id", "attendance", ["employee_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,149 @@
+"""initial schema
+
+Tables as they were created before migrations were introduced.
+Existing databases should be marked with 'alembic stamp aba1a120f97a'
+instead of running this revision.
+
+Revision ID: aba1a120f97a
+Revises:
+Create Date: 2026-10-18 18:49:49.159883
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "aba1a120f97a"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _created_at() -> sa.Column:
+    return sa.Column(
+        "created_at",
+        sa.TIMESTAMP(),
+        server_default=sa.text("current_timestamp"),
+        nullable=False,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.BIGINT(), autoincrement=False, nullable=False),
+        sa.Column("first_name", sa.String(length=30), nullable=False),
+        sa.Column("last_name", sa.String(length=30), nullable=True),
+        sa.Column("username", sa.String(length=30), nullable=True),
+        sa.Column("phone_number", sa.String(length=25), nullable=False),
+        _created_at(),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("phone_number"),
+    )
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        _created_at(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "branches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("owner_id", sa.BIGINT(), nullable=True),
+        _created_at(),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "product_rates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("payment_rate", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("effective_date", sa.DATE(), nullable=False),
+        sa.Column("end_date", sa.DATE(), nullable=False),
+        _created_at(),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "branch_products",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("branch_id", sa.Integer(), nullable=False),
+        _created_at(),
+        sa.ForeignKeyConstraint(["branch_id"], ["branches.id"]),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("product_id", "branch_id", name="uq_branch_product"),
+    )
+    op.create_table(
+        "employees",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("first_name", sa.String(), nullable=False),
+        sa.Column("last_name", sa.String(), nullable=False),
+        sa.Column("branch_id", sa.Integer(), nullable=False),
+        _created_at(),
+        sa.ForeignKeyConstraint(["branch_id"], ["branches.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "production_records",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "date", sa.DATE(), server_default=sa.text("current_date"), nullable=False
+        ),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("used_cement_amount", sa.Float(), nullable=False),
+        sa.Column("branch_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        _created_at(),
+        sa.ForeignKeyConstraint(["branch_id"], ["branches.id"]),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "sales_orders",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("branch_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "date", sa.DATE(), server_default=sa.text("current_date"), nullable=False
+        ),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Integer(), nullable=False),
+        sa.Column("total_amount", sa.BIGINT(), nullable=False),
+        _created_at(),
+        sa.ForeignKeyConstraint(["branch_id"], ["branches.id"]),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "attendance",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.Column("production_record_id", sa.Integer(), nullable=False),
+        _created_at(),
+        sa.ForeignKeyConstraint(["employee_id"], ["employees.id"]),
+        sa.ForeignKeyConstraint(["production_record_id"], ["production_records.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("attendance")
+    op.drop_table("sales_orders")
+    op.drop_table("production_records")
+    op.drop_table("employees")
+    op.drop_table("branch_products")
+    op.drop_table("product_rates")
+    op.drop_table("branches")
+    op.drop_table("products")
+    op.drop_table("users")
@@ -12,6 +12,7 @@ from resources.string import (ATTENDANCE, NO_PERMISSION, PRODUCT_QUANTITY,
                               SELECT_PERIOD, SELECT_PRODUCT,
                               SOLD_PRODUCT_PRICE, USED_CEMENT_AMOUNT,
                               WELCOME_TEXT)
+from utils.roster import WorkerRoster
 from utils.state_manager import Switch
 
 if TYPE_CHECKING:
@@ -39,7 +40,7 @@ async def cmd_start(
 async def show_branches(
     branch_repo: IBranchRepository,
 ) -> Tuple[str, InlineKeyboardMarkup]:
-    branches: List[Dict[str, Any]] = branch_repo.all(as_dict=True)  # type: ignore
+    branches: List[Dict[str, Any]] = await branch_repo.all(as_dict=True)  # type: ignore
 
     return (
         SELECT_BRANCH,
@@ -64,13 +65,13 @@ async def show_products(
     branch_id = form_data["branch_id"]
 
     try:
-        branch_name = branch_repo.get_by_id(branch_id=branch_id).name
+        branch_name = (await branch_repo.get_by_id(branch_id=branch_id)).name
 
     except RecordNotFound:
         branch_name = ""
 
     # load product from database
-    products = branch_repo.get_branch_products(branch_id=branch_id)
+    products = await branch_repo.get_branch_products(branch_id=branch_id)
 
     return SELECT_PRODUCT.format(branch_name), products_kb(products=products)
 
@@ -82,7 +83,7 @@ async def get_quantity(
 ) -> Tuple[str, InlineKeyboardMarkup]:
     form_data = await state.get_value("form_data", {})
     product_id = form_data["product_id"]
-    product_name = product_repo.get_by_id(product_id=product_id).name
+    product_name = (await product_repo.get_by_id(product_id=product_id)).name
 
     await state.update_data(product_name=product_name)
 
@@ -112,18 +113,16 @@ async def get_workers(
 
     branch_id = form_data["branch_id"]
 
-    workers = extras.get("workers", [])
-    present_employees = extras.get("present_employees", set())
-    if not workers:
-        workers = emp_repo.all(branch_id=branch_id)
-        present_employees = set(worker.id for worker in workers)
+    if extras.get("roster"):
+        roster = WorkerRoster(*extras["roster"])
 
-    extras.update(workers=workers, present_employees=present_employees)
-
-    await state.update_data(extras=extras)
+    else:
+        roster = WorkerRoster.from_employees(await emp_repo.all(branch_id=branch_id))
+        extras.update(roster=roster)
+        await state.update_data(extras=extras)
 
     return ATTENDANCE, workers_on_duty_kb(
-        workers=workers, present_employees=present_employees
+        roster=roster, page=extras.get("workers_page", 0)
     )
 
 
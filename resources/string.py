@@ -28,6 +28,8 @@ USED_CEMENT_AMOUNT = (
     "Ishlatilgan sement miqdorini kiriting (kilogrammda) <blockquote>{}</blockquote>"
 )
 ATTENDANCE = "Ishga kelmagan ishchilarni belgilang yoki 'tayyor' tugmasini bosing"
+PREVIOUS_PAGE = "⬅️"
+NEXT_PAGE = "➡️"
 
 SALES = "Sotuv"
 SOLD_PRODUCT_PRICE = "Sotilgan mahsulot narxini kiriting <blockquote>{}</blockquote>"
@@ -49,6 +51,8 @@ CALCULATING = "Hisoblanmoqda... Iltimos, biroz kuting."
 SELECT_PERIOD = "Hisobot uchun davrni tanlang"
 PREPARING_REPORT = "Hisobot tayyorlanmoqda..."
 REPORT_READY = "Hisobot tayyor! \nBosh menyuga qaytish uchun /stats"
+CATALOG_REFRESHED = "Bo'limlar, mahsulotlar va ishchilar ro'yxati yangilandi"
+REPORTS_BUSY = "Hozir juda ko'p hisobot tayyorlanmoqda. Iltimos, birozdan so'ng qayta urinib ko'ring"
 
 
 WEEKLY = "Haftalik"
@@ -73,6 +77,7 @@ DECEMBER = "Dekabr"
 
 CALCULATING_SALARY = "{} oyi uchun oylik hisoblanmoqda..."
 NO_RECORDS = "Ushbu tanlov bo'yicha hech qanday ma'lumotlar yo'q"
+NO_RATE = "{} uchun {} sanasida amalda bo'lgan to'lov stavkasi yo'q. Oylik hisoblanmadi"
 INVALID_RESPONSE = (
     "Kiritilgan ma'lumot noto'g'ri. \nIltimos qaytadan tekshirib ko'ring."
 )
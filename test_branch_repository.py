@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from data.db import get_async_sessionmaker
+from data.exceptions import RecordNotFound
+from data.models import Base, Branch, BranchProduct, Product, User
+from data.repositories import BranchRepository
+
+PRODUCTS = 30
+
+
+def count_statements(engine):
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    return statements
+
+
+async def make_repository(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[t.__table__ for t in (User, Branch, Product, BranchProduct)],
+        )
+
+    session = get_async_sessionmaker(engine)
+    async with session() as s:
+        s.add_all([Branch(id=1, name="1-seh"), Branch(id=2, name="2-seh")])
+        s.add_all(Product(id=i, name=f"Blok {i}") for i in range(1, PRODUCTS + 1))
+        await s.flush()
+        s.add_all(
+            BranchProduct(branch_id=1, product_id=i) for i in range(1, PRODUCTS + 1)
+        )
+        await s.commit()
+
+    return engine, BranchRepository(session=session, model=Branch)
+
+
+def test_get_branch_products_runs_one_query(tmp_path):
+    async def main():
+        engine, repository = await make_repository(tmp_path / "db.sqlite3")
+        statements = count_statements(engine)
+
+        products = await repository.get_branch_products(branch_id=1)
+        assert len(statements) == 1
+        assert products[0] == {"id": 1, "name": "Blok 1"}
+        assert len(products) == PRODUCTS
+
+        statements.clear()
+        assert await repository.get_branch_products(branch_id=2) == []
+        assert len(statements) == 1
+
+        statements.clear()
+        with pytest.raises(RecordNotFound):
+            await repository.get_branch_products(branch_id=3)
+        assert len(statements) == 1
+
+        await engine.dispose()
+
+    asyncio.run(main())
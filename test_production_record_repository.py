@@ -0,0 +1,135 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from data.db import get_async_sessionmaker
+from data.models import (
+    Attendance,
+    Base,
+    Employee,
+    Product,
+    ProductionRecord,
+    ProductRate,
+)
+from data.repositories import ProductionRecordRepository
+from test_branch_repository import count_statements
+
+
+async def make_repository(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session = get_async_sessionmaker(engine)
+    return engine, ProductionRecordRepository(session=session, model=ProductionRecord)
+
+
+def make_record(on_date=date(2025, 3, 1), product_id=1, quantity=100):
+    return ProductionRecord(
+        date=on_date,
+        quantity=quantity,
+        used_cement_amount=1.5,
+        branch_id=1,
+        product_id=product_id,
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 10, 100])
+def test_create_record_with_attendance_round_trips_do_not_grow(tmp_path, workers):
+    async def main():
+        engine, repository = await make_repository(tmp_path / "db.sqlite3")
+        statements = count_statements(engine)
+
+        record = await repository.create_record_with_attendance(
+            new_record=make_record(), employee_ids=range(1, workers + 1)
+        )
+        # the record, its attendance and the rollup
+        assert len(statements) == 3, statements
+
+        async with engine.connect() as conn:
+            attendance = await conn.scalar(
+                select(func.count()).where(Attendance.production_record_id == record.id)
+            )
+        assert attendance == workers
+
+        await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_records_are_paid_at_the_rate_in_effect_on_their_date(tmp_path):
+    async def main():
+        engine, repository = await make_repository(tmp_path / "db.sqlite3")
+
+        try:
+            async with get_async_sessionmaker(engine)() as session:
+                session.add_all(
+                    Employee(id=i, first_name=name, last_name="", branch_id=1)
+                    for i, name in ((1, "Ali"), (2, "Vali"))
+                )
+                session.add_all(
+                    [Product(id=1, name="Blok"), Product(id=2, name="Bordyur")]
+                )
+                # a rate for february, then one from march on, which is
+                # overridden by a newer one from the 15th
+                session.add_all(
+                    ProductRate(
+                        product_id=1,
+                        payment_rate=rate,
+                        effective_date=effective_date,
+                        end_date=end_date,
+                    )
+                    for rate, effective_date, end_date in (
+                        (100, date(2025, 2, 1), date(2025, 2, 28)),
+                        (150, date(2025, 3, 1), date(2099, 12, 31)),
+                        (200, date(2025, 3, 15), date(2099, 12, 31)),
+                    )
+                )
+                await session.commit()
+
+            for on_date, employee_ids in (
+                (date(2025, 2, 10), [1, 2]),  # 100 * 10 / 2 each
+                (date(2025, 3, 5), [1]),  # 150 * 10
+                (date(2025, 3, 20), [2]),  # 200 * 10
+            ):
+                await repository.create_record_with_attendance(
+                    new_record=make_record(on_date=on_date, quantity=10),
+                    employee_ids=employee_ids,
+                )
+
+            period = {"date_from": date(2025, 2, 1), "date_to": date(2025, 3, 31)}
+            salaries = await repository.salary_summary(branch_id=1, **period)
+            assert {s["first_name"]: float(s["salary"]) for s in salaries} == {
+                "Ali": 2_000,
+                "Vali": 2_500,
+            }
+            assert await repository.first_unrated_record(branch_id=1, **period) is None
+
+            # no rate covers january nor the other product
+            for record in (
+                make_record(on_date=date(2025, 1, 31)),
+                make_record(on_date=date(2025, 3, 25), product_id=2),
+            ):
+                await repository.create_record_with_attendance(
+                    new_record=record, employee_ids=[1]
+                )
+
+            unrated = await repository.first_unrated_record(
+                branch_id=1, date_from=date(2025, 1, 1), date_to=date(2025, 3, 31)
+            )
+            assert dict(unrated) == {"date": date(2025, 1, 31), "product_name": "Blok"}
+
+            unrated = await repository.first_unrated_record(branch_id=1, **period)
+            assert dict(unrated) == {
+                "date": date(2025, 3, 25),
+                "product_name": "Bordyur",
+            }
+
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
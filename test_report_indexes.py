@@ -0,0 +1,87 @@
+"""
+Checks with EXPLAIN that the report queries use their indexes.
+Needs PostgreSQL, set TEST_DATABASE_URL to run it, e.g.
+
+    TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost/test pytest
+
+The schema is created in a transaction that is rolled back.
+"""
+
+import asyncio
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from data.models import Base, Order, ProductionRecord
+from data.repositories import OrderRepository, ProductionRecordRepository
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+PERIOD = {"date_from": date(2025, 3, 1), "date_to": date(2025, 3, 31)}
+
+prod_record_repo = ProductionRecordRepository(session=None, model=ProductionRecord)
+order_repo = OrderRepository(session=None, model=Order)
+
+# statement -> index it must use
+CASES = {
+    "salary_summary": (
+        prod_record_repo._salary_summary_stmt(branch_id=1, **PERIOD),
+        "ix_production_records_branch_id_date",
+    ),
+    "salary_details": (
+        prod_record_repo._salary_details_stmt(branch_id=1, **PERIOD),
+        "ix_production_records_branch_id_date",
+    ),
+    "salary_details_crews": (
+        prod_record_repo._salary_details_stmt(branch_id=1, **PERIOD),
+        "ix_attendance_production_record_id",
+    ),
+    "first_unrated_record": (
+        prod_record_repo._first_unrated_stmt(branch_id=1, **PERIOD),
+        "ix_production_records_branch_id_date",
+    ),
+    "production_stat": (
+        prod_record_repo._stat_stmt(**PERIOD),
+        "daily_product_totals_pkey",
+    ),
+    "sales_filter": (
+        order_repo._filter_stmt(**PERIOD),
+        "daily_product_totals_pkey",
+    ),
+}
+
+
+async def explain(stmt):
+    engine = create_async_engine(DATABASE_URL)
+
+    try:
+        async with engine.connect() as conn:
+            await conn.begin()
+            await conn.run_sync(Base.metadata.create_all)
+            # the tables are empty, a sequential scan would always win
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+            sql = stmt.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            rows = (await conn.execute(text(f"EXPLAIN {sql}"))).scalars().all()
+            await conn.rollback()
+
+    finally:
+        await engine.dispose()
+
+    return "\n".join(rows)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_report_query_uses_index(case):
+    stmt, index = CASES[case]
+    plan = asyncio.run(explain(stmt))
+
+    assert index in plan, plan
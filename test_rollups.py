@@ -0,0 +1,107 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from data.db import get_async_sessionmaker
+from data.models import Base, DailyProductTotal, Order, ProductionRecord
+from data.repositories import OrderRepository, ProductionRecordRepository
+from data.rollups import rebuild_daily_totals
+
+
+async def read_totals(session):
+    async with session() as s:
+        rows = (
+            await s.execute(
+                select(DailyProductTotal).order_by(
+                    DailyProductTotal.date,
+                    DailyProductTotal.branch_id,
+                    DailyProductTotal.product_id,
+                )
+            )
+        ).scalars()
+
+        return [
+            (
+                row.date,
+                row.branch_id,
+                row.product_id,
+                row.produced_quantity,
+                row.used_cement_amount,
+                row.sold_quantity,
+                row.sold_amount,
+            )
+            for row in rows
+        ]
+
+
+def test_rollup_matches_rebuild(tmp_path):
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        try:
+            session = get_async_sessionmaker(engine)
+            prod_record_repo = ProductionRecordRepository(
+                session=session, model=ProductionRecord
+            )
+            order_repo = OrderRepository(session=session, model=Order)
+
+            # two records of the same day and product are summed in one row
+            for day, branch_id, product_id, quantity in (
+                (1, 1, 1, 100),
+                (1, 1, 1, 50),
+                (1, 2, 1, 70),
+                (2, 1, 2, 30),
+            ):
+                await prod_record_repo.create_record_with_attendance(
+                    new_record=ProductionRecord(
+                        date=date(2025, 3, day),
+                        quantity=quantity,
+                        used_cement_amount=quantity / 10,
+                        branch_id=branch_id,
+                        product_id=product_id,
+                    ),
+                    employee_ids=[1, 2],
+                )
+
+            await order_repo.create_new(
+                Order(
+                    date=date(2025, 3, 1),
+                    branch_id=1,
+                    product_id=1,
+                    quantity=20,
+                    price=1_000,
+                    total_amount=20_000,
+                )
+            )
+            # a day with sales only, and two orders of one key in one statement
+            await order_repo.create_many(
+                [
+                    {
+                        "date": date(2025, 3, 3),
+                        "branch_id": 1,
+                        "product_id": 1,
+                        "quantity": quantity,
+                        "price": 1_000,
+                        "total_amount": quantity * 1_000,
+                    }
+                    for quantity in (5, 15)
+                ]
+            )
+
+            totals = await read_totals(session)
+
+            async with session() as s:
+                await rebuild_daily_totals(s)
+                await s.commit()
+
+            assert totals == await read_totals(session)
+            assert len(totals) == 4
+
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
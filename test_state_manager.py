@@ -0,0 +1,75 @@
+import asyncio
+import datetime
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message
+
+from utils.state_manager import StateManager, Switch
+
+# chat id -> texts sent to it
+sent = {}
+
+
+class FakeMessage(Message):
+    async def edit_text(self, text, reply_markup=None, **kwargs):
+        sent.setdefault(self.chat.id, []).append(text)
+
+    async def answer(self, text, reply_markup=None, **kwargs):
+        sent.setdefault(self.chat.id, []).append(text)
+
+
+class Form(StatesGroup):
+    greet = State()
+
+
+def make_message(chat_id):
+    return FakeMessage(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=Chat(id=chat_id, type="private"),
+    )
+
+
+def make_state(storage, chat_id):
+    key = StorageKey(bot_id=1, chat_id=chat_id, user_id=chat_id)
+    return FSMContext(storage=storage, key=key)
+
+
+def make_state_mgr():
+    switch = Switch()
+
+    @switch.register("greet")
+    async def greet(message, state, greeting):
+        name = await state.get_value("name")
+        # let the other dispatch run in between
+        await asyncio.sleep(0.01)
+        return f"{greeting}, {name} ({message.chat.id})", None
+
+    state_mgr = StateManager(greeting="Salom")
+    state_mgr.include_switch(switch)
+
+    return state_mgr
+
+
+def test_concurrent_dispatches_do_not_share_message_and_state():
+    sent.clear()
+    state_mgr = make_state_mgr()
+    storage = MemoryStorage()
+
+    async def dispatch(chat_id, name):
+        state = make_state(storage, chat_id)
+        await state.set_state(Form.greet)
+        await state.update_data(name=name)
+        await state_mgr.dispatch_query(message=make_message(chat_id), state=state)
+
+    async def main():
+        await asyncio.gather(dispatch(1, "Ali"), dispatch(2, "Vali"))
+
+    asyncio.run(main())
+
+    assert sent == {1: ["Salom, Ali (1)"], 2: ["Salom, Vali (2)"]}
+    # per call values are not left on the shared dependencies
+    assert state_mgr.kwargs == {"greeting": "Salom"}
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple
+
+MISSING: Any = object()
+
+
+class TTLCache:
+    """
+    Size bounded LRU cache whose entries expire after 'ttl' seconds.
+    Counts hits and misses, see 'stats'.
+    """
+
+    __slots__ = ("_ttl", "_maxsize", "_data", "hits", "misses")
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize should be positive, got {maxsize}")
+
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._data: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Returns cached value or 'default' if there is no live entry
+        """
+        entry = self._data.get(key)
+
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self._data[key]
+
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        Stores the value, evicts the least recently used entry when full
+        """
+        if ttl is None:
+            ttl = self._ttl
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def keys(self) -> List[Hashable]:
+        """Keys of all entries, including the expired ones not dropped yet"""
+        return list(self._data)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
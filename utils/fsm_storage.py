@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import json
+import sqlite3
+import time
+import zlib
+from contextvars import ContextVar
+from copy import copy
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder
+
+if TYPE_CHECKING:
+    from aiogram.fsm.storage.base import KeyBuilder, StateType, StorageKey
+    from aiogram.types import TelegramObject
+
+logger = logging.getLogger(__name__)
+
+# encoded data longer than this is compressed
+COMPRESS_THRESHOLD = 256
+# how often expired records are removed from the file, in seconds
+PURGE_INTERVAL = 3600
+
+_PLAIN = b"j"
+_ZLIB = b"z"
+
+
+def _encode(data: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Data is stored as JSON, so it does not depend on the classes that
+    wrote it. Tuples come back as lists, named tuples like 'WorkerRoster'
+    are restored from them by the handlers.
+    """
+    if not data:
+        return None
+
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    if len(raw) > COMPRESS_THRESHOLD:
+        return _ZLIB + zlib.compress(raw)
+
+    return _PLAIN + raw
+
+
+def _decode(blob: Optional[bytes]) -> Dict[str, Any]:
+    if not blob:
+        return {}
+
+    try:
+        if blob[:1] == _ZLIB:
+            return json.loads(zlib.decompress(blob[1:]))
+
+        if blob[:1] == _PLAIN:
+            return json.loads(blob[1:])
+
+    except (zlib.error, ValueError):
+        pass
+
+    # written in another format, the user starts over
+    logger.warning("Dropped undecodable FSM data")
+    return {}
+
+
+# storage keys the current update touched, set by 'StorageFlushMiddleware'
+_touched: ContextVar[Optional[Set[str]]] = ContextVar("fsm_touched", default=None)
+
+
+class _Record:
+    __slots__ = "state", "data", "blob"
+
+    def __init__(
+        self,
+        state: Optional[str] = None,
+        data: Optional[Dict] = None,
+        blob: Optional[bytes] = None,
+    ):
+        self.state = state
+        self.data = data or {}
+        # 'data' as written to the file
+        self.blob = blob
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM storage kept in a local SQLite file, so users do not lose
+    unfinished forms when the bot restarts.
+
+    Changes are buffered in memory and written by 'flush' in one transaction
+    (see 'StorageFlushMiddleware'), so an update that calls 'update_data'
+    several times costs a single write. The middleware flushes only
+    the records its update touched, updates of other users that are
+    still running keep their buffers. Records that were not changed
+    for 'ttl' seconds are treated as empty and removed from the file.
+
+    Data must be JSON serializable, 'set_data' raises 'TypeError' otherwise.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: float,
+        key_builder: Optional[KeyBuilder] = None,
+    ) -> None:
+        self._ttl = ttl
+        self._key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fsm ("
+            "key TEXT PRIMARY KEY, state TEXT, data BLOB, touched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        # every access to the connection goes through this lock
+        self._lock = asyncio.Lock()
+        self._records: Dict[str, _Record] = {}
+        self._dirty: Dict[str, _Record] = {}
+        self._purged_at = 0.0
+
+        self.reads = 0
+        self.writes = 0
+        self.flushes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"reads": self.reads, "writes": self.writes, "flushes": self.flushes}
+
+    def _select(self, key: str) -> Optional[Tuple[Optional[str], Optional[bytes]]]:
+        return self._conn.execute(
+            "SELECT state, data FROM fsm WHERE key = ? AND touched_at >= ?",
+            (key, time.time() - self._ttl),
+        ).fetchone()
+
+    def _write(
+        self,
+        upserts: List[Tuple[str, Optional[str], Optional[bytes], float]],
+        deletes: List[Tuple[str]],
+        purge_before: Optional[float],
+    ) -> None:
+        with self._conn:
+            if upserts:
+                self._conn.executemany(
+                    "INSERT INTO fsm (key, state, data, touched_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "state = excluded.state, data = excluded.data, "
+                    "touched_at = excluded.touched_at",
+                    upserts,
+                )
+
+            if deletes:
+                self._conn.executemany("DELETE FROM fsm WHERE key = ?", deletes)
+
+            if purge_before is not None:
+                self._conn.execute(
+                    "DELETE FROM fsm WHERE touched_at < ?", (purge_before,)
+                )
+
+    async def _get_record(self, key: StorageKey) -> Tuple[str, _Record]:
+        raw_key = self._key_builder.build(key)
+        touched = _touched.get()
+        if touched is not None:
+            touched.add(raw_key)
+
+        record = self._records.get(raw_key)
+
+        if record is None:
+            async with self._lock:
+                row = await asyncio.to_thread(self._select, raw_key)
+
+            self.reads += 1
+            # another coroutine could load it while this one was waiting
+            record = self._records.get(raw_key)
+            if record is None:
+                record = (
+                    _Record()
+                    if row is None
+                    else _Record(row[0], _decode(row[1]), row[1])
+                )
+                self._records[raw_key] = record
+
+        return raw_key, record
+
+    async def flush(self, keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Writes buffered changes in one transaction and drops them
+        from the buffer.
+
+        Params
+            keys: storage keys to flush, all of them if None
+        """
+        if keys is None:
+            keys = list(self._records)
+
+        async with self._lock:
+            now = time.time()
+            upserts = []
+            deletes = []
+            for raw_key in keys:
+                # records are read again from the file after it is written,
+                # the lock keeps readers waiting until then
+                self._records.pop(raw_key, None)
+                record = self._dirty.pop(raw_key, None)
+                if record is None:
+                    continue
+
+                if record.state is None and not record.data:
+                    deletes.append((raw_key,))
+                else:
+                    upserts.append((raw_key, record.state, record.blob, now))
+
+            purge_before = None
+            if now - self._purged_at > PURGE_INTERVAL:
+                purge_before = now - self._ttl
+                self._purged_at = now
+
+            if upserts or deletes or purge_before is not None:
+                await asyncio.to_thread(self._write, upserts, deletes, purge_before)
+                self.writes += len(upserts) + len(deletes)
+                self.flushes += 1
+
+    async def close(self) -> None:
+        await self.flush()
+        self._conn.close()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        raw_key, record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._dirty[raw_key] = record
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        _, record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        # fails here, in the handler that stored the value, not in the flush
+        blob = _encode(data)
+
+        raw_key, record = await self._get_record(key)
+        record.data = data.copy()
+        record.blob = blob
+        self._dirty[raw_key] = record
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, record = await self._get_record(key)
+        return record.data.copy()
+
+    async def get_value(
+        self, storage_key: StorageKey, dict_key: str, default: Optional[Any] = None
+    ) -> Optional[Any]:
+        _, record = await self._get_record(storage_key)
+        return copy(record.data.get(dict_key, default))
+
+
+class StorageFlushMiddleware(BaseMiddleware):
+    """
+    Flushes 'SQLiteStorage' after every update, so all FSM changes
+    an update made are written at once. Only the records the update
+    touched are flushed.
+    """
+
+    def __init__(self, storage: SQLiteStorage) -> None:
+        self._storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        before = self._storage.stats
+        touched: Set[str] = set()
+        token = _touched.set(touched)
+
+        try:
+            return await handler(event, data)
+
+        finally:
+            _touched.reset(token)
+            await self._storage.flush(keys=touched)
+            after = self._storage.stats
+            logger.debug(
+                "FSM storage: %d reads, %d writes in %d flushes",
+                after["reads"] - before["reads"],
+                after["writes"] - before["writes"],
+                after["flushes"] - before["flushes"],
+            )
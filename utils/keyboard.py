@@ -6,15 +6,31 @@ from aiogram.types import InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from resources.string import BACK
+from utils.cache import MISSING, TTLCache
 
 if TYPE_CHECKING:
     from aiogram.types import InlineKeyboardMarkup
 
+# built keyboards by their spec, they never expire but the least
+# recently used ones are evicted
+_keyboards = TTLCache(ttl=float("inf"), maxsize=256)
+# part of every key, bumped when the catalog (branches, products) changes
+_version = 0
+
+
+def invalidate_keyboards() -> None:
+    """Makes keyboards built before the call to be rebuilt"""
+    global _version
+
+    _version += 1
+    _keyboards.clear()
+
 
 def make_inline_kb(
     buttons: List[Dict],
     size: Optional[List[int]] = None,
     back_btn: bool = False,
+    cache: bool = True,
     **kwargs,
 ) -> InlineKeyboardMarkup:
     """
@@ -23,8 +39,43 @@ def make_inline_kb(
         buttons - required, list of inline button parameters
         size - optional, keyboard size
         back_btn - optional, if true back button will be added
+        cache - optional, false for keyboards that are rarely built twice,
+            e.g. the ones showing the state of a form, so they don't
+            evict the shared ones
         **kwargs - parameters for 'InlineKeyboardMarkup'
+
+    Keyboards are cached by all of the above, so the returned markup
+    is shared and must not be modified
     """
+    if not cache:
+        return _build_inline_kb(buttons, size, back_btn, **kwargs)
+
+    try:
+        key = (
+            _version,
+            tuple(tuple(btn.items()) for btn in buttons),
+            tuple(size) if size else None,
+            back_btn,
+            tuple(kwargs.items()),
+        )
+        markup = _keyboards.get(key)
+
+    except TypeError:  # unhashable button parameter, e.g. a list
+        return _build_inline_kb(buttons, size, back_btn, **kwargs)
+
+    if markup is MISSING:
+        markup = _build_inline_kb(buttons, size, back_btn, **kwargs)
+        _keyboards.set(key, markup)
+
+    return markup
+
+
+def _build_inline_kb(
+    buttons: List[Dict],
+    size: Optional[List[int]] = None,
+    back_btn: bool = False,
+    **kwargs,
+) -> InlineKeyboardMarkup:
     ikb = InlineKeyboardBuilder()
 
     for btn in buttons:
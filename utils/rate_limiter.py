@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+    from aiogram.client.session.middlewares.base import NextRequestMiddlewareType
+    from aiogram.methods import Response, TelegramMethod
+    from aiogram.methods.base import TelegramType
+
+logger = logging.getLogger(__name__)
+
+HIGH_PRIORITY = 0  # replies to the user who is waiting for them
+LOW_PRIORITY = 1  # notifications, nobody waits for them
+
+_priority: ContextVar[int] = ContextVar("request_priority", default=HIGH_PRIORITY)
+
+
+@contextmanager
+def low_priority() -> Iterator[None]:
+    """Requests made inside are sent after the interactive ones"""
+    token = _priority.set(LOW_PRIORITY)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Allows 'rate' requests per second on average and bursts of 'capacity'.
+    'reserve' takes a token in advance and tells how long to wait for it.
+    """
+
+    __slots__ = "_rate", "_capacity", "_tokens", "_updated_at"
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """Returns seconds to wait before the request may be sent"""
+        self._refill()
+        self._tokens -= 1
+
+        return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def delay(self, tokens: float = 1) -> float:
+        """Returns seconds until 'tokens' are available, without taking one"""
+        self._refill()
+
+        return 0.0 if self._tokens >= tokens else (tokens - self._tokens) / self._rate
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self._tokens >= self._capacity
+
+
+class _PriorityGate:
+    """
+    Lets requests through as fast as the bucket allows. Waiting requests
+    are released by priority, then in arrival order. A low priority
+    request also leaves 'headroom' tokens in the bucket, so a burst
+    of them does not delay the next interactive one.
+    """
+
+    __slots__ = "_bucket", "_headroom", "_waiters", "_counter", "_release_handle"
+
+    def __init__(self, bucket: TokenBucket, headroom: float = 0) -> None:
+        self._bucket = bucket
+        self._headroom = headroom
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._release_handle: asyncio.TimerHandle | None = None
+
+    def queued(self) -> List[int]:
+        """Priorities of the waiting requests"""
+        return [priority for priority, _, fut in self._waiters if not fut.done()]
+
+    def is_idle(self) -> bool:
+        return not self._waiters and self._bucket.is_full()
+
+    def _delay(self, priority: int) -> float:
+        headroom = self._headroom if priority != HIGH_PRIORITY else 0
+        return self._bucket.delay(1 + headroom)
+
+    async def acquire(self, priority: int) -> bool:
+        """Waits for a token, returns whether the request was delayed"""
+        if not self._waiters and not self._delay(priority):
+            self._bucket.reserve()
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+
+        # it may be let through sooner than the request it overtook
+        if self._waiters[0][2] is future and self._release_handle is not None:
+            self._release_handle.cancel()
+            self._release_handle = None
+
+        self._schedule_release()
+        await future
+
+        return True
+
+    def _schedule_release(self) -> None:
+        if self._release_handle is None and self._waiters:
+            self._release_handle = asyncio.get_running_loop().call_later(
+                self._delay(self._waiters[0][0]), self._release
+            )
+
+    def _release(self) -> None:
+        self._release_handle = None
+
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():  # the request was cancelled
+                heapq.heappop(self._waiters)
+                continue
+
+            if self._delay(priority):
+                break
+
+            heapq.heappop(self._waiters)
+            self._bucket.reserve()
+            future.set_result(None)
+
+        self._schedule_release()
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware that keeps outgoing requests under
+    the Telegram flood limits.
+
+    Every request addressed to a chat waits for a token of that chat
+    and then for a global one. Waiting requests are released by priority
+    (see 'low_priority'), then in arrival order, in both cases. Low
+    priority requests leave one token of the chat burst to the replies,
+    the admin who gets the notifications is an interactive user too.
+    A request rejected with 'retry after' is sent again after the delay.
+    """
+
+    def __init__(
+        self,
+        chat_interval: float,
+        global_rate: float = 30,
+        chat_burst: int = 3,
+        max_retries: int = 3,
+    ) -> None:
+        """
+        Params
+            chat_interval: seconds between requests to one chat
+            global_rate: requests per second to all chats
+            chat_burst: requests one chat may get at once
+            max_retries: how many times 'retry after' is honored per request
+        """
+        self._chat_rate = 1 / chat_interval
+        self._chat_burst = chat_burst
+        # a burst of one can not spare a token
+        self._chat_headroom = min(1, chat_burst - 1)
+        self._max_retries = max_retries
+
+        self._chats: Dict[int | str, _PriorityGate] = {}
+        self._global = _PriorityGate(
+            TokenBucket(rate=global_rate, capacity=global_rate)
+        )
+
+        self.delayed = 0
+        self.retries = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Queue depth by priority and counters"""
+        queued = self._global.queued()
+        for gate in self._chats.values():
+            queued.extend(gate.queued())
+
+        return {
+            "queued_high": queued.count(HIGH_PRIORITY),
+            "queued_low": queued.count(LOW_PRIORITY),
+            "chats": len(self._chats),
+            "delayed": self.delayed,
+            "retries": self.retries,
+        }
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+
+        # getUpdates, answerCallbackQuery etc. are not limited
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        retries = 0
+        while True:
+            await self._acquire(chat_id)
+
+            try:
+                return await make_request(bot, method)
+
+            except TelegramRetryAfter as exc:
+                if retries == self._max_retries:
+                    raise
+
+                retries += 1
+                self.retries += 1
+                logger.warning(
+                    "Flood limit on %s to %s, retrying in %s s",
+                    method.__api_method__,
+                    chat_id,
+                    exc.retry_after,
+                )
+                await asyncio.sleep(exc.retry_after)
+
+    async def _acquire(self, chat_id: Any) -> None:
+        gate = self._chats.get(chat_id)
+        if gate is None:
+            self._drop_idle_chats()
+            gate = self._chats[chat_id] = _PriorityGate(
+                TokenBucket(rate=self._chat_rate, capacity=self._chat_burst),
+                headroom=self._chat_headroom,
+            )
+
+        priority = _priority.get()
+        delayed = await gate.acquire(priority)
+        delayed = await self._global.acquire(priority) or delayed
+
+        if delayed:
+            self.delayed += 1
+
+    def _drop_idle_chats(self) -> None:
+        if len(self._chats) < 10_000:
+            return
+
+        for chat_id in [k for k, gate in self._chats.items() if gate.is_idle()]:
+            del self._chats[chat_id]
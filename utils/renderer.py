@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from utils.visualize import to_pdf, to_table_pdf
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from utils.visualize import RenderedReport
+
+
+class ReportQueueFull(Exception):
+    """Raised when too many reports are being rendered already"""
+
+
+class ReportRenderer:
+    """
+    Renders reports in a pool of processes, so rendering does not
+    block the event loop. At most 'workers' reports are rendered at
+    the same time and 'queue_size' more may wait for a worker,
+    'ReportQueueFull' is raised for the next ones.
+
+    Memory of a process that rendered many reports slowly grows, outside
+    of python objects (see bench_report_memory.py), so a process is
+    replaced after 'max_tasks_per_worker' reports if it is set.
+    """
+
+    def __init__(
+        self, workers: int, queue_size: int, max_tasks_per_worker: Optional[int] = None
+    ) -> None:
+        self._workers = workers
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._limit = workers + queue_size
+        self._pending = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """Reports rendered or waiting for a worker"""
+        return self._pending
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # forking a process with a running event loop and open
+            # connections is unsafe, workers start from scratch
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self._max_tasks_per_worker,
+            )
+
+        return self._pool
+
+    async def to_pdf(
+        self,
+        title: str,
+        df: DataFrame,
+        period: Dict,
+        figsize: Optional[tuple[int, int]] = None,
+    ) -> RenderedReport:
+        """
+        Same as 'utils.visualize.to_pdf', but runs in a worker process.
+
+        Raises
+            ReportQueueFull - if 'workers' + 'queue_size' reports are pending
+        """
+        return await self._render(
+            to_pdf, title=title, df=df, period=period, figsize=figsize
+        )
+
+    async def to_table_pdf(
+        self, title: str, df: DataFrame, period: Dict
+    ) -> RenderedReport:
+        """
+        Same as 'utils.visualize.to_table_pdf', but runs in a worker process.
+
+        Raises
+            ReportQueueFull - if 'workers' + 'queue_size' reports are pending
+        """
+        return await self._render(to_table_pdf, title=title, df=df, period=period)
+
+    async def _render(
+        self, func: Callable[..., RenderedReport], **kwargs: Any
+    ) -> RenderedReport:
+        if self._pending >= self._limit:
+            raise ReportQueueFull(f"{self._pending} reports are pending already")
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), partial(func, **kwargs)
+            )
+
+        finally:
+            self._pending -= 1
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await asyncio.to_thread(self._pool.shutdown, wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Dict, Hashable, Optional, Tuple
+
+from pandas.util import hash_pandas_object
+
+from utils.cache import MISSING, TTLCache
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from pandas import DataFrame
+
+    from utils.visualize import RenderedReport
+
+
+class CachedReport:
+    __slots__ = "report", "file_id"
+
+    def __init__(self, report: RenderedReport, file_id: Optional[str] = None):
+        self.report = report
+        # set after the first upload, the document is re-sent by it
+        self.file_id = file_id
+
+
+class ReportCache:
+    """
+    Keeps rendered reports and their Telegram file ids.
+
+    A report is found by its key (report type, period, branch) as long as
+    no record was added in its period, see 'invalidate'. After that the
+    data is queried again and the report is found by the fingerprint of
+    the data, it is rendered again only if the data changed.
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self._fingerprints = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._reports = TTLCache(ttl=ttl, maxsize=maxsize)
+
+    @staticmethod
+    def make_key(
+        kind: str, period: Dict[str, date], branch_id: Optional[int] = None
+    ) -> Tuple[str, date, date, Optional[int]]:
+        return kind, period["date_from"], period["date_to"], branch_id
+
+    @staticmethod
+    def fingerprint(key: Hashable, df: DataFrame) -> str:
+        digest = hashlib.sha256(repr((key, list(df.columns))).encode())
+        digest.update(hash_pandas_object(df, index=False).values.tobytes())
+
+        return digest.hexdigest()
+
+    def get(self, key: Hashable) -> Optional[CachedReport]:
+        """Returns the report if nothing was added in its period since"""
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is MISSING:
+            return None
+
+        return self.find(fingerprint)
+
+    def find(self, fingerprint: str) -> Optional[CachedReport]:
+        """Returns the report rendered from the same data"""
+        cached = self._reports.get(fingerprint)
+
+        return None if cached is MISSING else cached
+
+    def put(
+        self, key: Hashable, fingerprint: str, cached: CachedReport
+    ) -> CachedReport:
+        self._fingerprints.set(key, fingerprint)
+        self._reports.set(fingerprint, cached)
+
+        return cached
+
+    def invalidate(self, day: date, branch_id: Optional[int] = None) -> None:
+        """
+        Call it after a record of the branch was added for 'day',
+        reports of all branches are invalidated as well
+        """
+        for key in self._fingerprints.keys():
+            _, date_from, date_to, key_branch_id = key  # type: ignore
+            if date_from <= day <= date_to and key_branch_id in (None, branch_id):
+                self._fingerprints.pop(key)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, List, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from typing import Sequence
+
+    from data.models import Employee
+
+
+class WorkerRoster(NamedTuple):
+    """
+    Workers of a branch and who of them is on duty, kept in FSM data
+    instead of 'Employee' objects.
+
+    'ids' and 'names' are parallel tuples, bit i of 'present' is set
+    when the worker at index i is on duty. Storages that turn tuples
+    into lists are fine, restore the roster with 'WorkerRoster(*value)'.
+    """
+
+    ids: Tuple[int, ...]
+    names: Tuple[str, ...]
+    present: int
+
+    @classmethod
+    def from_employees(cls, employees: Sequence[Employee]) -> WorkerRoster:
+        """Everybody is on duty by default"""
+        return cls(
+            ids=tuple(employee.id for employee in employees),
+            names=tuple(employee.first_name for employee in employees),
+            present=(1 << len(employees)) - 1,
+        )
+
+    def toggle(self, worker_id: int) -> WorkerRoster:
+        """
+        Marks the worker as present or absent.
+
+        Raises
+            ValueError - if the worker is not in the roster
+        """
+        index = self.ids.index(worker_id)
+        return self._replace(present=self.present ^ (1 << index))
+
+    def status(self, worker_id: int) -> Tuple[str, bool]:
+        """
+        Returns (first name, is on duty) of the worker.
+
+        Raises
+            ValueError - if the worker is not in the roster
+        """
+        index = self.ids.index(worker_id)
+        return self.names[index], bool(self.present >> index & 1)
+
+    def workers(self) -> Iterator[Tuple[int, str, bool]]:
+        """Yields (id, first name, is on duty) of every worker"""
+        for index, (worker_id, name) in enumerate(zip(self.ids, self.names)):
+            yield worker_id, name, bool(self.present >> index & 1)
+
+    def present_ids(self) -> List[int]:
+        return [worker_id for worker_id, _, on_duty in self.workers() if on_duty]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+from aiogram.exceptions import TelegramAPIError
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+    from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+# jobs due this close to each other are run together
+BATCH_WINDOW = 0.1
+# limit of 'deleteMessages'
+MAX_DELETE_BATCH = 100
+
+
+class _Deletion:
+    __slots__ = "bot", "chat_id", "message_id"
+
+    def __init__(self, bot: Bot, chat_id: int, message_id: int) -> None:
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+
+
+class DelayedTaskScheduler:
+    """
+    Runs jobs after a delay, so handlers do not have to sleep.
+    Jobs are kept in a heap ordered by due time and run by one
+    background task, message deletions due together are sent
+    as one 'deleteMessages' request per chat.
+
+    Start and stop it with the dispatcher, pending jobs are run
+    right away on stop.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def call_later(self, delay: float, job: Callable[[], Awaitable[Any]]) -> None:
+        """Runs 'job()' after 'delay' seconds"""
+        self._push(delay, job)
+
+    def delete_later(self, message: Message, delay: float) -> None:
+        """Deletes the message after 'delay' seconds"""
+        self._push(
+            delay,
+            _Deletion(
+                bot=message.bot,  # type: ignore
+                chat_id=message.chat.id,
+                message_id=message.message_id,
+            ),
+        )
+
+    def _push(self, delay: float, job: Any) -> None:
+        due = time.monotonic() + delay
+        if not self._heap or due < self._heap[0][0]:
+            self._wakeup.set()
+
+        heapq.heappush(self._heap, (due, next(self._counter), job))
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        self._run_jobs(self._pop_due(float("inf")))
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._run_jobs(self._pop_due(time.monotonic() + BATCH_WINDOW))
+
+    def _pop_due(self, until: float) -> List[Any]:
+        jobs = []
+        while self._heap and self._heap[0][0] <= until:
+            jobs.append(heapq.heappop(self._heap)[2])
+
+        return jobs
+
+    def _run_jobs(self, jobs: List[Any]) -> None:
+        deletions: Dict[Tuple[Bot, int], List[int]] = defaultdict(list)
+
+        for job in jobs:
+            if isinstance(job, _Deletion):
+                deletions[(job.bot, job.chat_id)].append(job.message_id)
+            else:
+                self._spawn(job())
+
+        for (bot, chat_id), message_ids in deletions.items():
+            for i in range(0, len(message_ids), MAX_DELETE_BATCH):
+                self._spawn(
+                    self._delete(bot, chat_id, message_ids[i : i + MAX_DELETE_BATCH])
+                )
+
+    def _spawn(self, coro: Awaitable[Any]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._running.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Delayed job failed", exc_info=task.exception())
+
+    @staticmethod
+    async def _delete(bot: Bot, chat_id: int, message_ids: List[int]) -> None:
+        try:
+            if len(message_ids) == 1:
+                await bot.delete_message(chat_id=chat_id, message_id=message_ids[0])
+            else:
+                await bot.delete_messages(chat_id=chat_id, message_ids=message_ids)
+
+        except TelegramAPIError as exc:  # already deleted, too old etc.
+            logger.debug("Could not delete %s in %s: %s", message_ids, chat_id, exc)
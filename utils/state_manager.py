@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import inspect
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State
 from aiogram.types import Message
 
+# values that are known only when a query is dispatched
+PER_CALL_ARGS = ("message", "state", "edit_msg")
+
 
 class Switch:
     def __init__(self, name: Optional[str] = None):
@@ -38,6 +41,8 @@ class StateManager(Switch):
         """
         super().__init__(name="State manager")
         self.kwargs = kwargs
+        # handler key -> (handler, its dependencies, its per call arguments)
+        self._plans: Dict[str, Tuple[Callable, Dict[str, Any], Tuple[str, ...]]] = {}
 
     async def push_state_stack(self, state: FSMContext, next_state: State) -> None:
         """
@@ -120,6 +125,38 @@ class StateManager(Switch):
             )
         self.handlers.update(**switch.handlers)
 
+        for handler_key, handler in switch.handlers.items():
+            self._plans[handler_key] = self._compile(handler)
+
+    def _compile(
+        self, handler: Callable
+    ) -> Tuple[Callable, Dict[str, Any], Tuple[str, ...]]:
+        """
+        Resolves the arguments of the handler once, so that dispatching
+        does not need to inspect it again.
+
+        Returns
+            (handler, dependencies it takes, per call arguments it takes)
+        """
+        args = inspect.getfullargspec(handler).args
+        per_call = tuple(k for k in args if k in PER_CALL_ARGS)
+        deps = {
+            k: self.kwargs[k] for k in args if k in self.kwargs and k not in per_call
+        }
+
+        return handler, deps, per_call
+
+    def _get_plan(
+        self, handler_key: str
+    ) -> Tuple[Callable, Dict[str, Any], Tuple[str, ...]]:
+        plan = self._plans.get(handler_key)
+
+        # handler registered on the state manager itself
+        if plan is None:
+            plan = self._plans[handler_key] = self._compile(self.handlers[handler_key])
+
+        return plan
+
     async def dispatch_query(
         self,
         message: Message,
@@ -143,12 +180,12 @@ class StateManager(Switch):
         if current is not None:
             handler_key = current.split(":")[-1]  # type: ignore
 
-        handler = self.handlers[handler_key]
-        args = inspect.getfullargspec(handler).args
-        self.kwargs.update(state=state, message=message, edit_msg=edit_msg)
-        params = {k: self.kwargs[k] for k in args if k in self.kwargs}
+        handler, deps, per_call = self._get_plan(handler_key)
+        call_values = {"message": message, "state": state, "edit_msg": edit_msg}
 
-        text, reply_markup = await handler(**params)
+        text, reply_markup = await handler(
+            **deps, **{k: call_values[k] for k in per_call}
+        )
 
         if edit_msg is True:
             try:
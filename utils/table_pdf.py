@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import math
+import zlib
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import matplotlib
+from fontTools import subset
+from fontTools.ttLib import TTFont
+from pandas import isna
+
+FONT_DIR = Path(matplotlib.get_data_path()) / "fonts" / "ttf"
+
+PAGE_SIZE = (842.0, 595.0)  # A4 landscape, points
+MARGIN = 36.0
+FONT_SIZE = 9.0
+MIN_FONT_SIZE = 6.0  # below it the page is widened instead
+TITLE_SIZE = 14.0
+CAPTION_SIZE = 10.0
+FOOTER_SIZE = 8.0
+ROW_HEIGHT = 1.8  # in font sizes
+CELL_PADDING = 4.0
+
+
+class _FontMetrics:
+    """Glyph ids and advance widths (per 1 pt of font size) of a font file"""
+
+    def __init__(self, path: Path) -> None:
+        self.data = path.read_bytes()
+        font = TTFont(BytesIO(self.data))
+
+        units = font["head"].unitsPerEm
+        glyph_ids = font.getReverseGlyphMap()
+        metrics = font["hmtx"].metrics
+
+        self.glyphs: Dict[str, Tuple[int, float]] = {
+            chr(code): (glyph_ids[name], metrics[name][0] / units)
+            for code, name in font.getBestCmap().items()
+        }
+        self.missing = (0, metrics[font.getGlyphOrder()[0]][0] / units)
+
+        self.bbox = [
+            round(v * 1000 / units)
+            for v in (
+                font["head"].xMin,
+                font["head"].yMin,
+                font["head"].xMax,
+                font["head"].yMax,
+            )
+        ]
+        self.ascent = round(font["hhea"].ascent * 1000 / units)
+        self.descent = round(font["hhea"].descent * 1000 / units)
+        self.cap_height = round(
+            getattr(font["OS/2"], "sCapHeight", font["hhea"].ascent) * 1000 / units
+        )
+
+
+@lru_cache(maxsize=None)
+def _metrics(file_name: str) -> _FontMetrics:
+    # loaded once per process, report workers keep them between reports
+    return _FontMetrics(FONT_DIR / file_name)
+
+
+class _Font:
+    """
+    A font of one document, encodes text as glyph ids and remembers
+    the glyphs in use, only they are embedded
+    """
+
+    def __init__(self, resource: str, file_name: str) -> None:
+        self.resource = resource
+        self.metrics = _metrics(file_name)
+        self.used: Dict[int, Tuple[str, float]] = {}
+        self._encoded: Dict[str, Tuple[str, float]] = {}
+
+    def encode(self, text: str) -> Tuple[str, float]:
+        """Returns the text as a hex string of glyph ids and its width per 1 pt"""
+        encoded = self._encoded.get(text)
+        if encoded is not None:
+            return encoded
+
+        glyphs = self.metrics.glyphs
+        hex_ids = []
+        width = 0.0
+        for char in text:
+            glyph_id, advance = glyphs.get(char, self.metrics.missing)
+            self.used[glyph_id] = (char, advance)
+            hex_ids.append(f"{glyph_id:04X}")
+            width += advance
+
+        encoded = self._encoded[text] = ("".join(hex_ids), width)
+        return encoded
+
+    def width(self, text: str, size: float) -> float:
+        return self.encode(text)[1] * size
+
+
+class _PdfWriter:
+    def __init__(self) -> None:
+        self._objects: List[bytes | None] = []
+
+    def reserve(self) -> int:
+        self._objects.append(None)
+        return len(self._objects)
+
+    def add(self, body: str, obj_id: int | None = None) -> int:
+        if obj_id is None:
+            obj_id = self.reserve()
+
+        self._objects[obj_id - 1] = body.encode("latin-1")
+        return obj_id
+
+    def add_stream(self, data: bytes, extra: str = "") -> int:
+        data = zlib.compress(data)
+        obj_id = self.reserve()
+        self._objects[obj_id - 1] = (
+            f"<< /Length {len(data)} /Filter /FlateDecode {extra}>>\nstream\n".encode()
+            + data
+            + b"\nendstream"
+        )
+        return obj_id
+
+    def write(self, root: int) -> bytes:
+        out = BytesIO()
+        out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+        offsets = []
+        for obj_id, body in enumerate(self._objects, start=1):
+            offsets.append(out.tell())
+            out.write(f"{obj_id} 0 obj\n".encode() + body + b"\nendobj\n")  # type: ignore
+
+        xref = out.tell()
+        out.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            out.write(f"{offset:010d} 00000 n \n".encode())
+        out.write(
+            f"trailer\n<< /Size {len(offsets) + 1} /Root {root} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n".encode()
+        )
+
+        return out.getvalue()
+
+
+def _embed_font(writer: _PdfWriter, font: _Font, tag: str) -> int:
+    """Embeds the used glyphs of the font, returns the id of the font object"""
+    ttf = TTFont(BytesIO(font.metrics.data))
+    options = subset.Options()
+    options.retain_gids = True  # glyph ids in the content stay valid
+    options.notdef_outline = True
+    options.name_IDs = []
+    options.layout_features = []
+    options.drop_tables += ["FFTM"]
+    subsetter = subset.Subsetter(options=options)
+    subsetter.populate(gids=list(font.used))
+    subsetter.subset(ttf)
+
+    out = BytesIO()
+    ttf.save(out)
+    name = f"{tag}+{ttf['name'].getDebugName(6) or 'Font'}"
+
+    data = out.getvalue()
+    file_id = writer.add_stream(data, extra=f"/Length1 {len(data)} ")
+    metrics = font.metrics
+    descriptor = writer.add(
+        f"<< /Type /FontDescriptor /FontName /{name} /Flags 32"
+        f" /FontBBox [{' '.join(map(str, metrics.bbox))}] /ItalicAngle 0"
+        f" /Ascent {metrics.ascent} /Descent {metrics.descent}"
+        f" /CapHeight {metrics.cap_height} /StemV 80 /FontFile2 {file_id} 0 R >>"
+    )
+
+    used = sorted(font.used.items())
+    widths = " ".join(f"{gid} [{round(advance * 1000)}]" for gid, (_, advance) in used)
+    cid_font = writer.add(
+        f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{name}"
+        " /CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >>"
+        f" /FontDescriptor {descriptor} 0 R /W [{widths}] /CIDToGIDMap /Identity >>"
+    )
+
+    # lets the text be copied and searched
+    chars = [
+        f"<{gid:04X}> <{char.encode('utf-16-be').hex().upper()}>"
+        for gid, (char, _) in used
+    ]
+    to_unicode = writer.add_stream(
+        (
+            "/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+            "/CMapName /Adobe-Identity-UCS def /CMapType 2 def\n"
+            "1 begincodespacerange <0000> <FFFF> endcodespacerange\n"
+            + "".join(
+                f"{len(chars[i : i + 100])} beginbfchar\n"
+                + "\n".join(chars[i : i + 100])
+                + "\nendbfchar\n"
+                for i in range(0, len(chars), 100)
+            )
+            + "endcmap CMapName currentdict /CMap defineresource pop end end"
+        ).encode()
+    )
+
+    return writer.add(
+        f"<< /Type /Font /Subtype /Type0 /BaseFont /{name} /Encoding /Identity-H"
+        f" /DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>"
+    )
+
+
+def _cell_text(value: Any) -> str:
+    if isna(value):
+        return ""
+
+    return str(value)
+
+
+def table_pdf(
+    title: str, caption: str, columns: Sequence[Any], rows: Iterable[Sequence[Any]]
+) -> bytes:
+    """
+    Writes the table as a pdf document, split into pages with the header
+    repeated on every page. Text is drawn straight into the page content,
+    so the time grows linearly with the number of cells, unlike a
+    matplotlib table which creates an artist per cell.
+
+    The font is made smaller for wide tables, down to 'MIN_FONT_SIZE',
+    the page is widened after that.
+
+    Params
+        title: shown at the top of every page
+        caption: shown to the right of the title, e.g. the period
+        columns: header of the table
+        rows: cells of the table, converted with 'str', NaN and None are empty
+
+    Returns
+        content of the pdf file
+    """
+    regular = _Font("F1", "DejaVuSans.ttf")
+    bold = _Font("F2", "DejaVuSans-Bold.ttf")
+
+    header = [_cell_text(column) for column in columns]
+    body = [[_cell_text(value) for value in row] for row in rows]
+
+    # column widths per 1 pt of font size
+    col_widths = [bold.encode(text)[1] for text in header]
+    for row in body:
+        for i, text in enumerate(row):
+            col_widths[i] = max(col_widths[i], regular.encode(text)[1])
+
+    page_width, page_height = PAGE_SIZE
+    padding = 2 * CELL_PADDING * len(col_widths)
+    available = page_width - 2 * MARGIN
+    size = FONT_SIZE
+    if sum(col_widths) * size + padding > available:
+        size = max(MIN_FONT_SIZE, (available - padding) / sum(col_widths))
+
+    widths = [width * size + 2 * CELL_PADDING for width in col_widths]
+    table_width = sum(widths)
+    page_width = max(page_width, table_width + 2 * MARGIN)
+
+    row_height = size * ROW_HEIGHT
+    table_top = page_height - MARGIN - TITLE_SIZE * 2
+    table_bottom = MARGIN + FOOTER_SIZE * 2
+    rows_per_page = max(1, math.floor((table_top - table_bottom) / row_height) - 1)
+    pages = max(1, math.ceil(len(body) / rows_per_page))
+
+    left = (page_width - table_width) / 2
+    edges = [left]
+    for width in widths:
+        edges.append(edges[-1] + width)
+
+    def text(font: _Font, font_size: float, x: float, y: float, value: str) -> str:
+        hex_ids, _ = font.encode(value)
+        return f"/{font.resource} {font_size:.2f} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm <{hex_ids}> Tj\n"
+
+    def row_text(font: _Font, cells: Sequence[str], top: float) -> List[str]:
+        baseline = top - row_height / 2 - size * 0.35
+        return [
+            text(
+                font,
+                size,
+                (edges[i] + edges[i + 1] - font.width(value, size)) / 2,
+                baseline,
+                value,
+            )
+            for i, value in enumerate(cells)
+            if value
+        ]
+
+    contents = []
+    for page in range(pages):
+        page_rows = body[page * rows_per_page : (page + 1) * rows_per_page]
+        bottom = table_top - row_height * (len(page_rows) + 1)
+
+        ops = [
+            f"0.9 g {left:.2f} {table_top - row_height:.2f} {table_width:.2f} {row_height:.2f} re f 0 g\n"
+        ]
+
+        # grid
+        ops.append("0.5 w\n")
+        for i in range(len(page_rows) + 2):
+            y = table_top - row_height * i
+            ops.append(f"{left:.2f} {y:.2f} m {edges[-1]:.2f} {y:.2f} l\n")
+        for x in edges:
+            ops.append(f"{x:.2f} {table_top:.2f} m {x:.2f} {bottom:.2f} l\n")
+        ops.append("S\nBT\n")
+
+        ops.append(
+            text(bold, TITLE_SIZE, left, page_height - MARGIN - TITLE_SIZE, title)
+        )
+        ops.append(
+            text(
+                regular,
+                CAPTION_SIZE,
+                edges[-1] - regular.width(caption, CAPTION_SIZE),
+                page_height - MARGIN - TITLE_SIZE,
+                caption,
+            )
+        )
+
+        ops.extend(row_text(bold, header, table_top))
+        for i, cells in enumerate(page_rows, start=1):
+            ops.extend(row_text(regular, cells, table_top - row_height * i))
+
+        page_number = f"{page + 1}/{pages}"
+        ops.append(
+            text(
+                regular,
+                FOOTER_SIZE,
+                edges[-1] - regular.width(page_number, FOOTER_SIZE),
+                MARGIN,
+                page_number,
+            )
+        )
+        ops.append("ET\n")
+        contents.append("".join(ops).encode("latin-1"))
+
+    writer = _PdfWriter()
+    catalog = writer.reserve()
+    pages_id = writer.reserve()
+    fonts = " ".join(
+        f"/{font.resource} {_embed_font(writer, font, tag)} 0 R"
+        for font, tag in ((regular, "AAAAAA"), (bold, "AAAAAB"))
+    )
+
+    page_ids = []
+    for content in contents:
+        content_id = writer.add_stream(content)
+        page_ids.append(
+            writer.add(
+                f"<< /Type /Page /Parent {pages_id} 0 R"
+                f" /MediaBox [0 0 {page_width:.2f} {page_height:.2f}]"
+                f" /Resources << /Font << {fonts} >> >> /Contents {content_id} 0 R >>"
+            )
+        )
+
+    writer.add(
+        f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}]"
+        f" /Count {len(page_ids)} >>",
+        obj_id=pages_id,
+    )
+    writer.add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>", obj_id=catalog)
+
+    return writer.write(root=catalog)
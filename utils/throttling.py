@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery
+
+from utils.cache import MISSING, TTLCache
+
+if TYPE_CHECKING:
+    from aiogram.types import TelegramObject
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Protects the handlers from users hammering the buttons.
+
+    - The same callback (same data on the same message) from one user
+      is handled once per 'window' seconds, repeated taps are dropped,
+      so a double tap on 'save' does not create two records.
+    - A user has at most 'max_in_flight' updates handled at a time,
+      the next 'max_queued' ones wait for their turn in arrival order,
+      the rest are dropped.
+
+    Register the same instance for messages and callback queries.
+    Dropped updates are counted in 'suppressed'.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        max_in_flight: int = 1,
+        max_queued: int = 3,
+        maxsize: int = 10_000,
+    ) -> None:
+        self._recent = TTLCache(ttl=window, maxsize=maxsize)
+        self._max_in_flight = max_in_flight
+        self._max_queued = max_queued
+        # user id -> (semaphore, updates holding or waiting for it)
+        self._users: Dict[int, list] = {}
+
+        self.suppressed = {"debounced": 0, "overflow": 0}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        if isinstance(event, CallbackQuery):
+            message_id = event.message.message_id if event.message else None
+            key = (user.id, message_id, event.data)
+
+            if self._recent.get(key) is not MISSING:
+                self.suppressed["debounced"] += 1
+                await event.answer()
+                return None
+
+            self._recent.set(key, True)
+
+        slot = self._users.get(user.id)
+        if slot is None:
+            slot = self._users[user.id] = [asyncio.Semaphore(self._max_in_flight), 0]
+
+        if slot[1] >= self._max_in_flight + self._max_queued:
+            self.suppressed["overflow"] += 1
+            logger.debug("Dropped an update of %d, too many in flight", user.id)
+            if isinstance(event, CallbackQuery):
+                await event.answer()
+            return None
+
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                return await handler(event, data)
+
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                del self._users[user.id]
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
-import os
 from decimal import Decimal
-from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from io import BytesIO
+from typing import AsyncIterable, Dict, Iterable, List, NamedTuple, Optional
 
-import matplotlib.pyplot as plt
-from pandas import DataFrame
+from matplotlib.figure import Figure
+from pandas import DataFrame, concat
 
-from config import MEDIA_DIR
+from utils.table_pdf import table_pdf
+
+# rows drawn in the thumbnail of a 'to_table_pdf' report
+THUMBNAIL_ROWS = 15
+
+
+class RenderedReport(NamedTuple):
+    file_name: str
+    pdf: bytes
+    thumbnail: bytes  # png
 
 
 def make_df(
@@ -31,21 +39,48 @@ def make_df(
     return df  # type: ignore
 
 
+async def make_df_from_batches(
+    batches: AsyncIterable[Iterable],
+    col_order: Optional[List[str]] = None,
+    column_names: Optional[List[str]] = None,
+    sort_by: Optional[str] = None,
+) -> DataFrame:
+    """
+    Same as 'make_df', but consumes the rows batch by batch (see the
+    'stream_*' repository methods). Only one batch is kept as dicts,
+    the others as DataFrames, which take far less memory.
+
+    Memory is not bounded: the returned DataFrame holds every row, as the
+    report drawn from it does, and the batch frames are kept next to it
+    until they are joined.
+    """
+    frames = [make_df(data=batch, col_order=col_order) async for batch in batches]
+
+    if frames:
+        df = concat(frames, ignore_index=True, copy=False)
+    else:
+        df = DataFrame(columns=col_order)
+
+    return make_df(data=df, column_names=column_names, sort_by=sort_by)
+
+
 def make_human_readable(df):
     return df.map(lambda x: f"{x:,}" if isinstance(x, (int, float, Decimal)) else x)  # type: ignore
 
 
-def to_pdf(
-    title: str, df: DataFrame, period: Dict, figsize: Optional[tuple[int, int]] = None
-) -> tuple[str, str]:
-
-    period_str = f"{period['date_from']:%d.%m.%Y} - {period['date_to']:%d.%m.%Y}"
+def _period_str(period: Dict) -> str:
+    return f"{period['date_from']:%d.%m.%Y} - {period['date_to']:%d.%m.%Y}"
 
-    # Create a figure and an axis
-    if figsize is None:
-        figsize = (8, 2)
 
-    _, ax = plt.subplots(figsize=figsize)
+def _table_figure(
+    title: str, df: DataFrame, period_str: str, figsize: tuple[int, int]
+) -> Figure:
+    """
+    Draws the table with matplotlib. A 'Figure' is created directly,
+    not through pyplot, so it is freed as soon as it is not referenced.
+    """
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
     ax.axis("off")
 
     # Set title
@@ -61,16 +96,60 @@ def to_pdf(
     table.set_fontsize(12)
     table.scale(1, 1.5)
 
-    file_path = Path(MEDIA_DIR, "reports", f"{title} - {period_str}.pdf")
-    thumbnail_path = Path(MEDIA_DIR, "thumbnails", f"{title} - {period_str}.png")
+    return fig
 
-    if os.path.exists(file_path):
-        os.remove(file_path)
 
-    if os.path.exists(thumbnail_path):
-        os.remove(thumbnail_path)
+def _thumbnail(fig: Figure) -> bytes:
+    thumbnail = BytesIO()
+    fig.savefig(thumbnail, bbox_inches="tight", dpi=100, format="png")
 
-    plt.savefig(file_path, bbox_inches="tight", dpi=200, format="pdf")
-    plt.savefig(thumbnail_path, bbox_inches="tight", dpi=100, format="png")
+    return thumbnail.getvalue()
 
-    return str(file_path), str(thumbnail_path)
+
+def to_pdf(
+    title: str, df: DataFrame, period: Dict, figsize: Optional[tuple[int, int]] = None
+) -> RenderedReport:
+    """Renders the table as a pdf document and a png thumbnail in memory"""
+    period_str = _period_str(period)
+
+    if figsize is None:
+        figsize = (8, 2)
+
+    fig = _table_figure(title=title, df=df, period_str=period_str, figsize=figsize)
+
+    pdf = BytesIO()
+    fig.savefig(pdf, bbox_inches="tight", dpi=200, format="pdf")
+
+    return RenderedReport(
+        file_name=f"{title} - {period_str}.pdf",
+        pdf=pdf.getvalue(),
+        thumbnail=_thumbnail(fig),
+    )
+
+
+def to_table_pdf(title: str, df: DataFrame, period: Dict) -> RenderedReport:
+    """
+    Same as 'to_pdf', but for large tables: the pdf is written by
+    'utils.table_pdf.table_pdf', on as many pages as needed, and only
+    the first 'THUMBNAIL_ROWS' rows are drawn by matplotlib for the thumbnail
+    """
+    period_str = _period_str(period)
+
+    pdf = table_pdf(
+        title=title,
+        caption=period_str,
+        columns=list(df.columns),
+        rows=df.itertuples(index=False, name=None),
+    )
+    fig = _table_figure(
+        title=title,
+        df=df.head(THUMBNAIL_ROWS),
+        period_str=period_str,
+        figsize=(16, 6),
+    )
+
+    return RenderedReport(
+        file_name=f"{title} - {period_str}.pdf",
+        pdf=pdf,
+        thumbnail=_thumbnail(fig),
+    )
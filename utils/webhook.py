@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from aiogram import Bot, Dispatcher
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """
+    Answers Telegram right away and handles the update in background,
+    like 'SimpleRequestHandler', but not more than 'concurrency_limit'
+    updates at the same time
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        concurrency_limit: int,
+        secret_token: Optional[str] = None,
+        **data: Any,
+    ) -> None:
+        super().__init__(
+            dispatcher=dispatcher,
+            bot=bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self._semaphore = asyncio.Semaphore(concurrency_limit)
+
+    async def _background_feed_update(self, bot: Bot, update: Dict[str, Any]) -> None:
+        async with self._semaphore:
+            await super()._background_feed_update(bot=bot, update=update)
+
+
+def make_webhook_app(
+    dp: Dispatcher,
+    bot: Bot,
+    path: str,
+    concurrency_limit: int,
+    secret_token: Optional[str] = None,
+    **kwargs: Any,
+) -> web.Application:
+    """
+    Makes the aiohttp application that feeds the updates posted to 'path'
+    to the dispatcher. Startup and shutdown of the dispatcher run with
+    the ones of the application, the bot session is closed on shutdown.
+    """
+    app = web.Application()
+    BoundedRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        concurrency_limit=concurrency_limit,
+        secret_token=secret_token,
+        **kwargs,
+    ).register(app, path=path)
+    setup_application(app, dp, bot=bot, **kwargs)
+
+    return app
+
+
+async def run_webhook(
+    dp: Dispatcher,
+    bot: Bot,
+    base_url: str,
+    path: str,
+    host: str,
+    port: int,
+    max_connections: int,
+    concurrency_limit: int,
+    secret_token: Optional[str] = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Registers the webhook and serves it until SIGTERM or SIGINT,
+    then shuts the dispatcher down like 'Dispatcher.start_polling' does.
+
+    Params
+        base_url: public https address the server is reachable at
+        path: path of the webhook on the server
+        host, port: address to listen on
+        max_connections: connections Telegram may open at the same time
+        concurrency_limit: updates handled at the same time
+        secret_token: checked on every request if set
+        kwargs: dependencies for the handlers, same as for 'start_polling'
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    with suppress(NotImplementedError):  # signals are not supported on Windows
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+    app = make_webhook_app(
+        dp,
+        bot,
+        path=path,
+        concurrency_limit=concurrency_limit,
+        secret_token=secret_token,
+        **kwargs,
+    )
+    runner = web.AppRunner(app)
+    # emits the startup of the dispatcher
+    await runner.setup()
+
+    try:
+        await bot.set_webhook(
+            url=f"{base_url.rstrip('/')}{path}",
+            secret_token=secret_token,
+            max_connections=max_connections,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+
+        site = web.TCPSite(runner, host=host, port=port)
+        await site.start()
+        logger.info("Webhook server is listening on %s:%d%s", host, port, path)
+
+        await stop.wait()
+        logger.info("Stopping the webhook server")
+
+    finally:
+        # waits for the updates in flight, then emits the shutdown
+        # of the dispatcher and closes the bot session
+        await runner.cleanup()
+
+        with suppress(NotImplementedError):
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(sig)